@@ -1,10 +1,14 @@
 from quart import Quart
 
 from game.preprocessors import on_startup, on_shutdown
+from game.static_files import StaticFilesMiddleware, static_files_index
+from game.templating import configure_templates
 from game.urls import game_blueprint
 
 app = Quart(__name__, static_folder=None)
+configure_templates(app)
 app.register_blueprint(game_blueprint)
+app.asgi_app = StaticFilesMiddleware(app.asgi_app, static_files_index)
 
 app.before_serving(on_startup)
 app.after_serving(on_shutdown)
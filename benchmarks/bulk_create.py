@@ -0,0 +1,55 @@
+import asyncio
+import sys
+import time
+
+from settings import db
+
+BENCHMARK_TABLE = 'bulk_create_benchmark'
+ROWS_COUNTS = (1000, 10000, 100000)
+
+
+async def execute(query: str):
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query)
+
+
+async def per_row_create(rows):
+    for row in rows:
+        await db.create(table=BENCHMARK_TABLE, columns=['name', 'score'], values=list(row))
+
+
+async def bulk_create(rows):
+    await db.bulk_create(table=BENCHMARK_TABLE, columns=['name', 'score'], rows=rows)
+
+
+async def measure(fun, rows):
+    await execute(f'TRUNCATE TABLE {BENCHMARK_TABLE}')
+    started_at = time.perf_counter()
+    await fun(rows)
+    return time.perf_counter() - started_at
+
+
+async def main(max_per_row_count: int = 10000):
+    await db.create_connection_pool()
+    try:
+        await execute(f'CREATE TABLE IF NOT EXISTS {BENCHMARK_TABLE} ('
+                      f'id int not null auto_increment primary key, '
+                      f'name varchar(50) not null, '
+                      f'score int not null default 0)')
+        for rows_count in ROWS_COUNTS:
+            rows = [(f'name_{i}', i) for i in range(rows_count)]
+            bulk_seconds = await measure(bulk_create, rows)
+            if rows_count <= max_per_row_count:
+                per_row_seconds = await measure(per_row_create, rows)
+                comparison = f'per-row create {per_row_seconds:8.3f} s, speedup x{per_row_seconds / bulk_seconds:.1f}'
+            else:
+                comparison = 'per-row create skipped'
+            print(f'{rows_count:>6} rows: bulk_create {bulk_seconds:8.3f} s, {comparison}')
+        await execute(f'DROP TABLE {BENCHMARK_TABLE}')
+    finally:
+        await db.close_all_connections()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(*map(int, sys.argv[1:2])))
@@ -0,0 +1,37 @@
+import secrets
+import sys
+import timeit
+
+import bcrypt
+
+from game.signing import make_csrf_token, verify_csrf_token
+
+
+def bcrypt_render(cookie_token: bytes):
+    return bcrypt.hashpw(cookie_token, bcrypt.gensalt()).decode('utf-8')
+
+
+def bcrypt_check(cookie_token: bytes, form_token: str):
+    return bcrypt.checkpw(cookie_token, form_token.encode('utf-8'))
+
+
+def main(number: int = 20):
+    cookie_token = secrets.token_hex(32)
+    bcrypt_form_token = bcrypt_render(cookie_token.encode('utf-8'))
+    hmac_form_token = make_csrf_token(cookie_token)
+
+    results = {
+        'bcrypt render': timeit.timeit(lambda: bcrypt_render(cookie_token.encode('utf-8')), number=number) / number,
+        'bcrypt check': timeit.timeit(lambda: bcrypt_check(cookie_token.encode('utf-8'), bcrypt_form_token),
+                                      number=number) / number,
+        'hmac render': timeit.timeit(lambda: make_csrf_token(cookie_token), number=number * 1000) / (number * 1000),
+        'hmac check': timeit.timeit(lambda: verify_csrf_token(cookie_token, hmac_form_token),
+                                    number=number * 1000) / (number * 1000),
+    }
+    for name, seconds in results.items():
+        print(f'{name:<15} {seconds * 1e6:12.2f} us per call')
+    print(f'render speedup: x{results["bcrypt render"] / results["hmac render"]:.0f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,55 @@
+import random
+import sys
+import time
+
+from game.dictionary import Dictionary
+
+SYLLABLES = ['ка', 'ро', 'ма', 'ни', 'ло', 'ст', 'пе', 'ре', 'до', 'ва', 'ли', 'ту', 'за', 'бо', 'ше']
+ENDINGS = ['', 'а', 'ы', 'у', 'ом', 'ой', 'ами', 'ах', 'ов', 'ий', 'ая', 'ое']
+
+
+def generate_words(words_count: int, seed: int = 0):
+    generator = random.Random(seed)
+    words = set()
+    while len(words) < words_count:
+        stem = ''.join(generator.choice(SYLLABLES) for _ in range(generator.randint(1, 5)))
+        for ending in generator.sample(ENDINGS, generator.randint(1, len(ENDINGS))):
+            words.add(stem + ending)
+    return sorted(words)[:words_count]
+
+
+def set_size(words: set):
+    return sys.getsizeof(words) + sum(sys.getsizeof(word) for word in words)
+
+
+def per_second(fun, arguments):
+    started_at = time.perf_counter()
+    for argument in arguments:
+        fun(argument)
+    return len(arguments) / (time.perf_counter() - started_at)
+
+
+def main(words_count: int = 1000000, queries_count: int = 100000):
+    words = generate_words(words_count)
+    started_at = time.perf_counter()
+    dictionary = Dictionary.from_words(words)
+    build_seconds = time.perf_counter() - started_at
+
+    words_set = set(words)
+    generator = random.Random(1)
+    queries = [generator.choice(words) for _ in range(queries_count // 2)] + \
+              [word[::-1] for word in generator.sample(words, queries_count // 2)]
+    prefixes = [word[:generator.randint(1, len(word))] for word in generator.sample(words, queries_count)]
+
+    print(f'{len(dictionary)} words, {dictionary.nodes_count} nodes, built in {build_seconds:.1f} s')
+    print(f'size: dawg {dictionary.size / 2 ** 20:.1f} MiB, '
+          f'text {sum(len(word.encode("utf-8")) + 1 for word in words) / 2 ** 20:.1f} MiB, '
+          f'python set {set_size(words_set) / 2 ** 20:.1f} MiB')
+    print(f'membership: dawg {per_second(dictionary.__contains__, queries):,.0f}/s, '
+          f'python set {per_second(words_set.__contains__, queries):,.0f}/s')
+    print(f'prefix count: dawg {per_second(dictionary.count_prefix, prefixes):,.0f}/s')
+    print(f'word index: dawg {per_second(dictionary.index, queries):,.0f}/s')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
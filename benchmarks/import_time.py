@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+MODULES = ('settings', 'management', 'app_settings')
+TOP_IMPORTS_COUNT = 10
+
+
+def import_time(module: str):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            capture_output=True, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, imported_module = line[len('import time:'):].split('|')
+        if not imported_module.startswith('  '):
+            imports.append((int(cumulative), imported_module.strip()))
+    return result.returncode, imports
+
+
+def main(modules=MODULES):
+    for module in modules:
+        return_code, imports = import_time(module)
+        if return_code != 0:
+            print(f'{module:<15} import failed')
+            continue
+        total = sum(cumulative for cumulative, _ in imports)
+        print(f'{module:<15} {total / 1000:8.1f} ms')
+        for cumulative, imported_module in sorted(imports, reverse=True)[:TOP_IMPORTS_COUNT]:
+            print(f'    {imported_module:<40} {cumulative / 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or MODULES)
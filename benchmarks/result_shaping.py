@@ -0,0 +1,37 @@
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+
+from game.results import flatten_rows, rows_to_records
+
+ROWS_COUNTS = (1, 10, 100, 1000)
+
+
+def numpy_flatten(rows):
+    return np.asarray(rows).reshape(-1).tolist()
+
+
+def import_time(module: str):
+    return float(subprocess.check_output(
+        [sys.executable, '-c', f'import time; start = time.perf_counter(); import {module}; '
+                               f'print(time.perf_counter() - start)']))
+
+
+def main(number: int = 10000):
+    for rows_count in ROWS_COUNTS:
+        single_column_rows = tuple((f'value_{i}',) for i in range(rows_count))
+        multi_column_rows = tuple((i, f'name_{i}', f'code_{i}') for i in range(rows_count))
+        numpy_seconds = timeit.timeit(lambda: numpy_flatten(single_column_rows), number=number) / number
+        flatten_seconds = timeit.timeit(lambda: flatten_rows(single_column_rows), number=number) / number
+        records_seconds = timeit.timeit(lambda: rows_to_records(multi_column_rows, ('id', 'name', 'code')),
+                                        number=number) / number
+        print(f'{rows_count:>5} rows: numpy {numpy_seconds * 1e6:9.2f} us, flatten {flatten_seconds * 1e6:9.2f} us, '
+              f'records {records_seconds * 1e6:9.2f} us')
+    print(f'import numpy: {import_time("numpy") * 1e3:.1f} ms, '
+          f'import game.results: {import_time("game.results") * 1e3:.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
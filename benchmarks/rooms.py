@@ -0,0 +1,69 @@
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.dictionary import generate_words
+from game.dictionary import Dictionary
+from game.rooms import Room, Player
+from game.solver import Solver, is_source_word_candidate
+
+
+async def play_room(room: Room, players_count: int, words_per_player: int, generator: random.Random):
+    players = [Player(f'player_{i}') for i in range(players_count)]
+    delivered = 0
+
+    async def consume(player: Player):
+        nonlocal delivered
+        while await player.receive() is not None:
+            delivered += 1
+
+    consumers = [asyncio.get_running_loop().create_task(consume(player)) for player in players]
+    for player in players:
+        room.join(player)
+    room.request_start(players[0])
+    await asyncio.sleep(0)
+    candidates = list(room.answers) + ['несуществующее', 'аб']
+    for _ in range(words_per_player):
+        for player in players:
+            room.submit(player, generator.choice(candidates))
+        await asyncio.sleep(0)
+    room.post(('finish', None, None))
+    await asyncio.gather(*consumers)
+    return delivered
+
+
+async def main(rooms_count: int = 2000, players_count: int = 4, words_per_player: int = 20):
+    words = generate_words(20000)
+    solver = Solver(Dictionary.from_words(words))
+    generator = random.Random(0)
+    source_words = [word for word in words if is_source_word_candidate(word)][:200]
+    answers = {source_word: [word for word in solver.words(source_word) if word != source_word]
+               for source_word in source_words}
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    game_rooms = []
+    for room_index in range(rooms_count):
+        source_word = source_words[room_index % len(source_words)]
+        room = Room(f'room_{room_index}', creator='player_0', lang_code='ru', source_word=source_word,
+                    answers=answers[source_word], max_players=players_count, duration=3600)
+        room.start()
+        game_rooms.append(room)
+    memory_per_room = (tracemalloc.get_traced_memory()[0] - memory_before) / rooms_count
+    tracemalloc.stop()
+
+    started_at = time.perf_counter()
+    delivered = await asyncio.gather(*(play_room(room, players_count, words_per_player, generator)
+                                       for room in game_rooms))
+    elapsed = time.perf_counter() - started_at
+    events_count = rooms_count * players_count * (words_per_player + 1)
+    print(f'{rooms_count} rooms x {players_count} players, {words_per_player} words per player')
+    print(f'{memory_per_room / 1024:.1f} KiB per idle room')
+    print(f'{elapsed:.2f} s, {events_count / elapsed:,.0f} events/s, '
+          f'{sum(delivered) / elapsed:,.0f} messages delivered/s')
+
+
+if __name__ == '__main__':
+    asyncio.run(main(*map(int, sys.argv[1:4])))
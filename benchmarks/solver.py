@@ -0,0 +1,55 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.dictionary import generate_words
+from game.dictionary import DictionaryBuilder, Dictionary
+from game.solver import Solver, build_answers, is_source_word_candidate
+
+
+def timed(fun, *args, **kwargs):
+    started_at = time.perf_counter()
+    result = fun(*args, **kwargs)
+    return result, time.perf_counter() - started_at
+
+
+def main(words_count: int = 100000, queries_count: int = 200, processes: int = None):
+    words = generate_words(words_count)
+    builder = DictionaryBuilder()
+    for word in words:
+        builder.add(word)
+    with tempfile.TemporaryDirectory() as folder:
+        dictionary_path = os.path.join(folder, 'benchmark.dawg')
+        with open(dictionary_path, 'wb') as dictionary_file:
+            dictionary_file.write(builder.to_bytes())
+        solver = Solver(Dictionary.load(dictionary_path))
+
+        generator = random.Random(0)
+        candidates = [word for word in words if is_source_word_candidate(word)]
+        source_words = generator.sample(candidates, min(queries_count, len(candidates)))
+        solver.words(source_words[0])
+        found_counts, seconds = [], []
+        for source_word in source_words:
+            found, elapsed = timed(solver.words, source_word)
+            found_counts.append(len(found))
+            seconds.append(elapsed)
+        seconds.sort()
+        print(f'{len(words)} words, {len(candidates)} source word candidates')
+        print(f'sub-anagrams search: median {seconds[len(seconds) // 2] * 1e3:.2f} ms, '
+              f'p99 {seconds[int(len(seconds) * 0.99)] * 1e3:.2f} ms, '
+              f'{sum(found_counts) / len(found_counts):.0f} words found on average')
+
+        checks = [(generator.choice(words), generator.choice(source_words)) for _ in range(100000)]
+        _, elapsed = timed(lambda: [solver.can_form(word, letters) for word, letters in checks])
+        print(f'can_form: {len(checks) / elapsed:,.0f} checks/s')
+
+        candidates_count, elapsed = timed(build_answers, dictionary_path, os.path.join(folder, 'benchmark.answers'),
+                                          processes=processes)
+        print(f'batch precompute: {candidates_count} source words in {elapsed:.1f} s '
+              f'({candidates_count / elapsed:,.0f}/s, processes={processes or os.cpu_count()})')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:4]))
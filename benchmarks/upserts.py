@@ -0,0 +1,119 @@
+import asyncio
+import sys
+import time
+
+from settings import db
+
+UNIQUE_TABLE = 'upserts_benchmark_unique'
+PLAIN_TABLE = 'upserts_benchmark_plain'
+
+
+async def global_questions():
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+            return int((await cur.fetchone())[1])
+
+
+async def execute(query: str):
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query)
+            return await cur.fetchall()
+
+
+async def select_then_get_or_create(table: str, columns: list, values: list):
+    found_ids = await db.filter(table=table, columns=['id'], condition={columns[0]: values[0]})
+    if found_ids:
+        return found_ids[0], False
+    return await db.create(table=table, columns=columns, values=values), True
+
+
+async def select_then_create_if_does_not_exist(table: str, columns: list, values: list):
+    if await db.filter(table=table, columns=['id'], condition={columns[0]: values[0]}):
+        return False
+    await db.create(table=table, columns=columns, values=values)
+    return True
+
+
+async def select_then_update_or_create(table: str, columns: list, values: list):
+    if await db.filter(table=table, columns=['id'], condition={columns[0]: values[0]}):
+        await db.update(table=table, columns=columns, values=values, condition={columns[0]: values[0]})
+        return False
+    await db.create(table=table, columns=columns, values=values)
+    return True
+
+
+PATHS = {
+    'single statement': {
+        'get_or_create': db.get_or_create,
+        'create_if_does_not_exist': db.create_if_does_not_exist,
+        'update_or_create': db.update_or_create,
+    },
+    'select then insert': {
+        'get_or_create': select_then_get_or_create,
+        'create_if_does_not_exist': select_then_create_if_does_not_exist,
+        'update_or_create': select_then_update_or_create,
+    },
+}
+
+
+async def timed_call(method, latencies: list, **kwargs):
+    started_at = time.perf_counter()
+    try:
+        return await method(**kwargs)
+    finally:
+        latencies.append(time.perf_counter() - started_at)
+
+
+async def hammer(path_name: str, method_name: str, table: str, coroutines_count: int, names_count: int):
+    await execute(f'TRUNCATE TABLE {table}')
+    method = PATHS[path_name][method_name]
+    latencies = []
+    questions_before = await global_questions()
+    started_at = time.perf_counter()
+    results = await asyncio.gather(*(timed_call(method, latencies, table=table, columns=['name', 'score'],
+                                                values=[f'name_{i % names_count}', i])
+                                     for i in range(coroutines_count)), return_exceptions=True)
+    elapsed = time.perf_counter() - started_at
+    questions = await global_questions() - questions_before - 1
+    errors = sum(isinstance(result, Exception) for result in results)
+    (rows_count, distinct_names_count), = await execute(f'SELECT COUNT(*), COUNT(DISTINCT name) FROM {table}')
+    duplicates = rows_count - distinct_names_count
+    latencies.sort()
+    p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+    print(f'{path_name:<18} {method_name:<25} {table:<25} {elapsed:6.3f} s, '
+          f'p50 {p50 * 1e3:6.2f} ms, p99 {p99 * 1e3:6.2f} ms, '
+          f'{questions / coroutines_count:.2f} queries per call, duplicates {duplicates}, errors {errors}')
+    return duplicates, errors
+
+
+async def main(coroutines_count: int = 2000, names_count: int = 100):
+    await db.create_connection_pool()
+    failed = False
+    try:
+        await execute(f'CREATE TABLE IF NOT EXISTS {UNIQUE_TABLE} ('
+                      f'id int not null auto_increment primary key, '
+                      f'name varchar(50) not null unique, '
+                      f'score int not null default 0)')
+        await execute(f'CREATE TABLE IF NOT EXISTS {PLAIN_TABLE} ('
+                      f'id int not null auto_increment primary key, '
+                      f'name varchar(50) not null, '
+                      f'score int not null default 0, '
+                      f'index (name))')
+        for method_name in PATHS['single statement']:
+            duplicates, errors = await hammer('single statement', method_name, UNIQUE_TABLE,
+                                              coroutines_count, names_count)
+            failed = failed or duplicates > 0 or errors > 0
+            for table in (UNIQUE_TABLE, PLAIN_TABLE):
+                await hammer('select then insert', method_name, table, coroutines_count, names_count)
+        await execute(f'DROP TABLE {UNIQUE_TABLE}')
+        await execute(f'DROP TABLE {PLAIN_TABLE}')
+    finally:
+        await db.close_all_connections()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main(*map(int, sys.argv[1:3])))
@@ -0,0 +1,33 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+background_tasks = set()
+
+
+def start_background_task(coro):
+    task = asyncio.get_running_loop().create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
+def run_periodically(fun, interval: float, *args, **kwargs):
+    async def periodic_task():
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await fun(*args, **kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f'Background task "{fun.__name__}" failed')
+    return start_background_task(periodic_task())
+
+
+async def stop_background_tasks():
+    tasks = list(background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+from game.metrics import Counter, Gauge
+
+
+class LRUCache:
+    def __init__(self, name: str, max_size: int, labels: dict = None):
+        self.name = name
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self.hits = Counter(f'{name}_cache_hits_total', f'Hits of "{name}" cache', labels=labels)
+        self.misses = Counter(f'{name}_cache_misses_total', f'Misses of "{name}" cache', labels=labels)
+        self.evictions = Counter(f'{name}_cache_evictions_total', f'Evictions from "{name}" cache', labels=labels)
+        Gauge(f'{name}_cache_size', f'Current size of "{name}" cache', labels=labels, function=self.__len__)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses.inc()
+            return default
+        self._items.move_to_end(key)
+        self.hits.inc()
+        return value
+
+    def set(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evictions.inc()
+
+    def pop(self, key, default=None):
+        return self._items.pop(key, default)
+
+    def keys(self):
+        return list(self._items)
+
+    def clear(self):
+        self._items.clear()
+
+
+class VersionedCache(LRUCache):
+    def __init__(self, name: str, max_size: int):
+        super(VersionedCache, self).__init__(name=name, max_size=max_size)
+        self.version = None
+        self.invalidations = Counter(f'{name}_cache_invalidations_total',
+                                     f'Invalidations of "{name}" cache caused by version change')
+
+    def update_version(self, version):
+        if version != self.version:
+            if self.version is not None:
+                self.invalidations.inc()
+            self.clear()
+            self.version = version
+            return True
+        return False
@@ -4,3 +4,54 @@ PATHS_WITHOUT_LOGIN = [
     #'/',
 ]
 DEFAULT_LANG_CODE = 'en'
+METRICS_PATH = '/metrics'
+
+TRANSLATIONS_CACHE_MAX_SIZE = 1024
+TRANSLATIONS_VERSION_CHECK_INTERVAL = 10
+
+LANGUAGES_REGISTRY_TTL = 300
+
+AUTH_TOKEN_COOKIE = 'auth_token'
+SESSION_LIFETIME = 24 * 60 * 60
+REMEMBERED_SESSION_LIFETIME = 30 * 24 * 60 * 60
+SESSIONS_CACHE_MAX_SIZE = 10000
+SESSIONS_CACHE_TTL = 60
+SESSIONS_SYNC_INTERVAL = 5
+SESSIONS_SYNC_CHUNK_SIZE = 1000
+CSRF_TOKEN_NONCE_SIZE = 16
+
+STATEMENTS_CACHE_MAX_SIZE = 512
+MIGRATIONS_CHECK_INTERVAL = 30
+
+BULK_MAX_ROWS_PER_STATEMENT = 1000
+BULK_MAX_PACKET_SIZE = 4 * 1024 * 1024
+
+SESSION_WRITES_MAX_SIZE = 10000
+SESSION_WRITES_FLUSH_SIZE = 500
+SESSION_WRITES_FLUSH_INTERVAL = 1.0
+SESSION_WRITES_MAX_RETRIES = 5
+WRITE_BEHIND_RETRY_BACKOFF = 1.0
+WRITE_BEHIND_MAX_RETRY_BACKOFF = 30.0
+
+USER_PROFILES_CACHE_MAX_SIZE = 10000
+PROFILE_FRAGMENTS_CACHE_MAX_SIZE = 5000
+
+MIN_WORD_LENGTH = 3
+SOURCE_WORD_MIN_LENGTH = 8
+SOURCE_WORD_MAX_LENGTH = 14
+SOLVER_EDGES_CACHE_DEPTH = 4
+
+DIFFICULTY_LEVELS = ('easy', 'medium', 'hard')
+SOURCE_WORD_MIN_ANSWERS = 10
+SOURCE_WORDS_REFRESH_INTERVAL = 600
+
+ROOM_MAX_PLAYERS = 8
+ROOM_ROUND_DURATION = 180
+ROOM_IDLE_TIMEOUT = 600
+ROOM_PLAYER_MAX_QUEUED_MESSAGES = 256
+ROOM_MAX_MESSAGE_SIZE = 256
+ROOM_MOVED_CLOSE_CODE = 4302
+
+HASH_RING_REPLICAS = 64
+ROOM_REGISTRY_REFRESH_INTERVAL = 2
+ROOM_WORKER_TTL = 10
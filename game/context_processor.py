@@ -1,19 +1,26 @@
 import secrets
 
-import bcrypt
 from quart import url_for
 
-from settings import db, lang_db
+from game.signing import make_csrf_token
+from game.static_files import static_files_index
+from settings import lang_db
 
 
 def static_files_context_processor(*path, blueprint='', **kwargs):
-    return url_for(endpoint=f'{blueprint}.static', filename='/'.join(path), **kwargs)
+    filename = '/'.join(path)
+    if not blueprint:
+        file_hash = static_files_index.file_hash(filename)
+        if file_hash is not None:
+            kwargs['v'] = file_hash
+    return url_for(endpoint=f'{blueprint}.static', filename=filename, **kwargs)
 
 
-def csrf_context_processor(request):
-    cookies = request.cookies
-    cookies_csrf_token = cookies.get('csrf_token').encode('utf-8')
-    return bcrypt.hashpw(cookies_csrf_token, bcrypt.gensalt()).decode('utf-8')
+def csrf_context_processor(request, request_vars):
+    cookies_csrf_token = request.cookies.get('csrf_token')
+    if cookies_csrf_token is None:
+        cookies_csrf_token = request_vars.csrf_cookie_token = secrets.token_hex(32)
+    return make_csrf_token(cookies_csrf_token)
 
 
 def nonce_context_processor():
@@ -26,8 +33,8 @@ async def user_data_context_processor(request, request_vars):
     if request_vars.is_authorized:
         if request_vars.get('user_data') is None:
             user_data = {}
-            username = request.cookies['username']
-            user_color = await db.get(table='user', columns=['sign_color'], condition=f'name="{username}"')
+            username = request_vars.username
+            user_color = (await request_vars.user_loader.get(username)).sign_color
             username_first_letter = username[0].upper()
             user_data['username'] = username
             user_data['user_color'] = user_color
@@ -1,11 +1,53 @@
+import asyncio
+import logging
 import os
+import time
+import traceback
+from contextlib import asynccontextmanager
+from weakref import WeakKeyDictionary
+
+from aiomysql import create_pool, SSCursor
+from pymysql import ProgrammingError
+
+from game.cache import VersionedCache
+from game.constants import TRANSLATIONS_CACHE_MAX_SIZE, LANGUAGES_REGISTRY_TTL, STATEMENTS_CACHE_MAX_SIZE, \
+    BULK_MAX_ROWS_PER_STATEMENT, BULK_MAX_PACKET_SIZE
+from game.database_exceptions import ObjectDoesNotExist, MultipleObjectsExist, ConnectionAcquireTimeout
+from game.decorators import database_errors_handler
+from game.languages import LanguagesRegistry
+from game.metrics import Counter, Gauge, Histogram
+from game.query_builder import QueryBuilder, quote_identifier
+from game.results import shape_rows
+from game.translations import TranslationsTable
 
-import numpy as np
-from aiomysql import create_pool
-from pymysql import IntegrityError
+logger = logging.getLogger(__name__)
 
-from game.database_exceptions import ObjectDoesNotExist, MultipleObjectsExist
-from game.decorators import database_errors_handler
+
+def value_size(value):
+    if isinstance(value, (bytes, bytearray)):
+        return len(value) + 12
+    return len(str(value).encode('utf-8')) + 4
+
+
+def insert_row_size(row):
+    return sum(value_size(value) for value in row) + 3
+
+
+def bulk_update_row_size(row, key_size: int, overhead: int):
+    return sum(key_size + value_size(value) + overhead for value in row[1:]) + key_size
+
+
+def chunk_rows(rows, max_rows: int, max_packet_size: int, header_size: int = 0, row_size=insert_row_size):
+    chunk, chunk_size = [], header_size
+    for row in rows:
+        current_row_size = row_size(row)
+        if chunk and (len(chunk) >= max_rows or chunk_size + current_row_size > max_packet_size):
+            yield chunk
+            chunk, chunk_size = [], header_size
+        chunk.append(row)
+        chunk_size += current_row_size
+    if chunk:
+        yield chunk
 
 
 class DatabaseMeta(type):
@@ -25,72 +67,201 @@ class Database(metaclass=DatabaseMeta):
             cls.instance = super(Database, cls).__new__(cls)
         return cls.instance
 
-    def __init__(self, db: str, user: str, password: str, defaults: dict = None):
+    _default_pool_settings = {
+        'min_size': 1,
+        'max_size': 10,
+        'recycle': -1,
+        'connect_timeout': None,
+        'acquire_timeout': None,
+        'health_check_interval': None,
+    }
+
+    def __init__(self, db: str, user: str, password: str, defaults: dict = None, host: str = 'localhost',
+                 port: int = 3306, pool_settings: dict = None, track_connections: bool = False):
         self._connection_pool = None
+        self._tables_columns = {}
+        self._connections_released_at = WeakKeyDictionary()
+        self._track_connections = track_connections
+        self._held_connections = {}
+        self._update_listeners = {}
+        self._query_builder = QueryBuilder(db=db, cache_max_size=STATEMENTS_CACHE_MAX_SIZE)
         self.__db = db
         self.__user = user
         self.__password = password
+        self.__host = host
+        self.__port = port
+        self._pool_settings = {**self._default_pool_settings, **(pool_settings or {})}
         if defaults is not None:
             self._defaults = defaults
 
+        metrics_labels = {'db': db}
+        Gauge('db_pool_size', 'Connections opened by the pool', labels=metrics_labels,
+              function=lambda: 0 if self._connection_pool is None else self._connection_pool.size)
+        Gauge('db_pool_free_connections', 'Idle connections in the pool', labels=metrics_labels,
+              function=lambda: 0 if self._connection_pool is None else self._connection_pool.freesize)
+        Gauge('db_pool_max_size', 'Maximum connections of the pool', labels=metrics_labels,
+              function=lambda: self._pool_settings['max_size'])
+        self._acquire_wait_time = Histogram('db_pool_acquire_seconds', 'Time spent waiting for a pool connection',
+                                            labels=metrics_labels)
+        self._acquire_timeouts = Counter('db_pool_acquire_timeouts_total', 'Pool connection acquire timeouts',
+                                         labels=metrics_labels)
+        self._health_check_failures = Counter('db_pool_health_check_failures_total',
+                                              'Pool connections that failed a ping on checkout', labels=metrics_labels)
+
     async def create_connection_pool(self):
-        self._connection_pool = await create_pool(port=3306, user=self.__user, password=self.__password, db=self.__db)
+        self._connection_pool = await create_pool(host=self.__host, port=self.__port, user=self.__user,
+                                                  password=self.__password, db=self.__db,
+                                                  minsize=self._pool_settings['min_size'],
+                                                  maxsize=self._pool_settings['max_size'],
+                                                  pool_recycle=self._pool_settings['recycle'],
+                                                  connect_timeout=self._pool_settings['connect_timeout'],
+                                                  autocommit=True)
+        self._tables_columns = {}
+
+    async def acquire_connection(self):
+        acquire_started_at = time.monotonic()
+        try:
+            conn = await asyncio.wait_for(self._connection_pool.acquire(),
+                                          timeout=self._pool_settings['acquire_timeout'])
+        except asyncio.TimeoutError:
+            self._acquire_timeouts.inc()
+            raise ConnectionAcquireTimeout(f'Connection was not acquired in '
+                                           f'{self._pool_settings["acquire_timeout"]} seconds')
+        finally:
+            self._acquire_wait_time.observe(time.monotonic() - acquire_started_at)
+
+        health_check_interval = self._pool_settings['health_check_interval']
+        released_at = self._connections_released_at.pop(conn, None)
+        if health_check_interval is not None and released_at is not None and \
+                time.monotonic() - released_at >= health_check_interval:
+            try:
+                await conn.ping(reconnect=True)
+            except Exception:
+                self._health_check_failures.inc()
+                conn.close()
+                self._connection_pool.release(conn)
+                raise
+        if self._track_connections:
+            self._held_connections[id(conn)] = (time.monotonic(), ''.join(traceback.format_stack(limit=12)[:-1]))
+        return conn
 
     def release_connection(self, conn):
+        self._held_connections.pop(id(conn), None)
+        if not conn.closed:
+            self._connections_released_at[conn] = time.monotonic()
         self._connection_pool.release(conn)
 
+    @asynccontextmanager
+    async def connection(self, connection=None):
+        if connection is not None:
+            yield connection
+            return
+        conn = await self.acquire_connection()
+        try:
+            yield conn
+        finally:
+            self.release_connection(conn)
+
+    @asynccontextmanager
+    async def transaction(self, connection=None):
+        if connection is not None:
+            yield connection
+            return
+        conn = await self.acquire_connection()
+        try:
+            await conn.begin()
+            yield conn
+            await conn.commit()
+        except BaseException:
+            try:
+                await conn.rollback()
+            except Exception:
+                conn.close()
+            raise
+        finally:
+            self.release_connection(conn)
+
+    def report_leaked_connections(self, threshold: float):
+        now = time.monotonic()
+        leaked_connections = [(now - acquired_at, stack) for acquired_at, stack in self._held_connections.values()
+                              if now - acquired_at >= threshold]
+        for held_seconds, stack in leaked_connections:
+            logger.warning(f'Connection to "{self.__db}" is held for {held_seconds:.1f} seconds. '
+                           f'Acquired at:\n{stack}')
+        return len(leaked_connections)
+
     async def close_all_connections(self):
         if self._connection_pool is not None:
             self._connection_pool.close()
             await self._connection_pool.wait_closed()
 
-    async def filter(self, table: str, columns: list = None, condition: str = None,
-                     connection=None, close_connection=True, **kwargs):
-        if connection is None:
-            conn = await self._connection_pool.acquire()
-        else:
-            conn = connection
-        if columns is None:
-            columns_to_select = '*'
+    async def get_table_columns(self, table: str, connection=None):
+        table_columns = self._tables_columns.get(table)
+        if table_columns is not None:
+            return table_columns
+        async with self.connection(connection) as conn:
             async with conn.cursor() as cur:
-                await cur.execute(
-                    f"SELECT COUNT(*) as `count` FROM information_schema.columns WHERE table_name='{table}'")
-                columns_count = list(await cur.fetchall())[0][0]
+                await cur.execute('SELECT column_name FROM information_schema.columns '
+                                  'WHERE table_schema=DATABASE() AND table_name=%s ORDER BY ordinal_position',
+                                  (table,))
+                table_columns = tuple(row[0] for row in await cur.fetchall())
+        if table_columns:
+            self._tables_columns[table] = table_columns
+        return table_columns
+
+    def refresh_tables_metadata(self, tables: list = None):
+        if tables is None:
+            self._tables_columns = {}
         else:
-            columns_to_select = ','.join('`' + str(item) + '`' for item in columns)
-            columns_count = len(columns)
+            for table in tables:
+                self._tables_columns.pop(table, None)
+
+    async def get_migrations_version(self):
+        async with self.connection() as conn:
+            async with conn.cursor() as cur:
+                try:
+                    await cur.execute('SELECT COUNT(*), MAX(id) FROM migrations')
+                    return tuple(await cur.fetchone())
+                except ProgrammingError:
+                    return None
+
+    def add_update_listener(self, table: str, listener):
+        self._update_listeners.setdefault(table, []).append(listener)
+
+    def _notify_update(self, table: str, condition=None):
+        for listener in self._update_listeners.get(table, ()):
+            try:
+                listener(table, condition)
+            except Exception:
+                logger.exception(f'Update listener of "{table}" table failed')
+
+    async def filter(self, table: str, columns: list = None, condition=None, connection=None, **kwargs):
         join_tables = kwargs.get('join_tables')
         join_conditions = kwargs.get('join_conditions')
-        join_command_part = ''
         if join_tables is not None:
             if join_conditions is None:
                 raise AttributeError('"join_tables" cannot be passed without "join_conditions"')
+            elif len(join_tables) != len(join_conditions):
+                raise AttributeError('Lengths of "join_tables" and "join_conditions" must be the same')
+
+        async with self.connection(connection) as conn:
+            if columns is None:
+                columns_count = 0
+                for selected_table in [table] + list(join_tables or []):
+                    columns_count += len(await self.get_table_columns(selected_table, connection=conn))
             else:
-                if len(join_tables) != len(join_conditions):
-                    raise AttributeError('Lengths of "join_tables" and "join_conditions" must be the same')
-                else:
-                    for tab, cond in zip(join_tables, join_conditions):
-                        join_command_part += f'JOIN {tab} ON {cond}\n'
-
-        db_command = f"SELECT {columns_to_select} FROM `{table}`" + f' {join_command_part}'
-        if condition is not None:
-            db_command += f" WHERE {condition}"
-        async with conn.cursor() as cur:
-            await cur.execute(db_command)
-            result = list(await cur.fetchall())
+                columns_count = len(columns)
 
-        if columns_count == 1:
-            result = np.asarray(result).reshape(-1).tolist()
-        if close_connection:
-            self.release_connection(conn)
-            return result
-        else:
-            return result, conn
+            db_command, params = self._query_builder.select(table=table, columns=columns, condition=condition,
+                                                            join_tables=join_tables, join_conditions=join_conditions)
+            async with conn.cursor() as cur:
+                await cur.execute(db_command, params)
+                as_records = kwargs.get('as_records', False)
+                return shape_rows(await cur.fetchall(), columns_count=columns_count, as_records=as_records,
+                                  columns=[column_info[0] for column_info in cur.description] if as_records else None)
 
-    async def get(self, table: str, columns: list = None, condition: str = None, **kwargs):
-        result, conn = await self.filter(table=table, columns=columns, condition=condition, close_connection=False,
-                                         **kwargs)
-        self.release_connection(conn)
+    async def get(self, table: str, columns: list = None, condition=None, **kwargs):
+        result = await self.filter(table=table, columns=columns, condition=condition, **kwargs)
         if len(result) == 0:
             raise ObjectDoesNotExist('No objects found')
         elif len(result) == 1:
@@ -100,144 +271,228 @@ class Database(metaclass=DatabaseMeta):
 
 
 class CommonDatabase(Database):
-    async def __check_existence(self, table: str, columns: list, values: list,
-                                columns_to_check: list = None, close_connection: bool = True):
-        if columns_to_check is None:
-            columns_check = columns
-            values_check = values
-        else:
-            sorter = np.argsort(columns)
-            indices = sorter[np.searchsorted(columns, columns_to_check, sorter=sorter)]
-            columns_check = np.asarray(columns)[indices].tolist()
-            values_check = np.asarray(values)[indices].tolist()
-        exist_condition = ' AND '.join(
-            col + "=" + "'" + str(val) + "'" for col, val in zip(columns_check, values_check))
-        return await self.filter(table=table, columns=columns,
-                                 condition=exist_condition,
-                                 close_connection=close_connection)
-
-    async def get_or_create(self, table: str, columns: list, values: list, **kwargs):
-        found_objs, conn = await self.filter(table=table, columns=columns,
-                                             condition=' AND '.join(
-                                                 col + "=" + str(val) for col, val in zip(columns, values)),
-                                             close_connection=False, **kwargs)
-        if len(found_objs) == 0:
-            table_defaults = self._defaults.get(table)
-            if table_defaults is not None:
-                columns += table_defaults.keys()
-                values += table_defaults.values()
-
-            async with conn.cursor() as cur:
-                try:
-                    await cur.execute(f"INSERT INTO `{table}` (" + ','.join(columns) +
-                                      f") VALUES (" + ','.join("'" + str(item) + "'" for item in values) + ")")
-                    await conn.commit()
-                    self.release_connection(conn)
-                    # return await self.get_columns(table=table, columns=columns)
-                except Exception as e:
-                    self.release_connection(conn)
-                    raise Exception(str(e))
-        elif len(found_objs) == 1:
-            self.release_connection(conn)
-            return found_objs
-        else:
-            self.release_connection(conn)
-            raise MultipleObjectsExist('More than 1 object found')
-
-    async def create_if_does_not_exist(self, table: str, columns: list, values: list, columns_to_check: list = None):
-        found_objs, conn = await self.__check_existence(table=table, columns=columns, values=values,
-                                                        columns_to_check=columns_to_check, close_connection=False)
-        if len(found_objs) == 0:
-            table_defaults = self._defaults.get(table)
-            if table_defaults is not None:
-                columns += table_defaults.keys()
-                values += table_defaults.values()
-
-            async with conn.cursor() as cur:
-                try:
-                    await cur.execute(f"INSERT INTO `{table}` (" + ','.join(columns) +
-                                      f") VALUES (" + ','.join("'" + str(item) + "'" for item in values) + ")")
-                    await conn.commit()
-                    self.release_connection(conn)
-                except IntegrityError:
-                    self.release_connection(conn)
-        else:
-            self.release_connection(conn)
-
-    async def create(self, table: str, columns: list, values: list, connection=None):
-        if connection is None:
-            conn = await self._connection_pool.acquire()
-        else:
-            conn = connection
+    def __add_defaults(self, table: str, columns: list, values: list):
         table_defaults = self._defaults.get(table)
+        columns, values = list(columns), list(values)
         if table_defaults is not None:
-            columns += table_defaults.keys()
-            values += table_defaults.values()
+            for column, value in table_defaults.items():
+                if column not in columns:
+                    columns.append(column)
+                    values.append(value)
+        return columns, values
+
+    async def __insert(self, conn, table: str, columns: list, values: list, **insert_options):
+        columns, values = self.__add_defaults(table, columns, values)
         async with conn.cursor() as cur:
-            await cur.execute(f"INSERT INTO `{table}` (" + ','.join(columns) +
-                              f") VALUES (" + ','.join("'" + str(item) + "'" for item in values) + ")")
-            await conn.commit()
-        self.release_connection(conn)
+            await cur.execute(self._query_builder.insert(table=table, columns=columns, **insert_options), values)
+            return cur.rowcount, cur.lastrowid
 
-    async def update(self, table: str, columns: list, values: list, condition: str, connection=None):
-        if connection is None:
-            conn = await self._connection_pool.acquire()
-        else:
-            conn = connection
-        async with conn.cursor() as cur:
-            found_objs, _ = await self.filter(table=table, columns=columns, condition=condition,
-                                              connection=conn, close_connection=False)
+    async def get_or_create(self, table: str, columns: list, values: list, id_column: str = 'id', connection=None):
+        async with self.connection(connection) as conn:
+            affected_rows, object_id = await self.__insert(conn, table, columns, values,
+                                                           last_insert_id_column=id_column)
+        return object_id, affected_rows == 1
+
+    async def create_if_does_not_exist(self, table: str, columns: list, values: list, connection=None):
+        async with self.connection(connection) as conn:
+            affected_rows, _ = await self.__insert(conn, table, columns, values, ignore=True)
+        return affected_rows == 1
+
+    async def create(self, table: str, columns: list, values: list, connection=None):
+        async with self.connection(connection) as conn:
+            _, object_id = await self.__insert(conn, table, columns, values)
+        return object_id
+
+    async def bulk_create(self, table: str, columns: list, rows, max_rows: int = BULK_MAX_ROWS_PER_STATEMENT,
+                          max_packet_size: int = BULK_MAX_PACKET_SIZE, ignore: bool = False, connection=None):
+        columns_with_defaults, default_values = self.__add_defaults(table, columns, [])
+        created_rows = 0
+        header_size = len(self._query_builder.insert(table=table, columns=columns_with_defaults, rows_count=1,
+                                                     ignore=ignore).encode('utf-8'))
+        defaults_size = sum(value_size(value) for value in default_values)
+        async with self.connection(connection) as conn:
+            async with conn.cursor() as cur:
+                for chunk in chunk_rows(rows, max_rows, max_packet_size, header_size=header_size,
+                                        row_size=lambda row: insert_row_size(row) + defaults_size):
+                    values = []
+                    for row in chunk:
+                        values.extend(row)
+                        values.extend(default_values)
+                    await cur.execute(self._query_builder.insert(table=table, columns=columns_with_defaults,
+                                                                 rows_count=len(chunk), ignore=ignore), values)
+                    created_rows += cur.rowcount
+        return created_rows
+
+    async def bulk_update(self, table: str, key_column: str, columns: list, rows,
+                          max_rows: int = BULK_MAX_ROWS_PER_STATEMENT, max_packet_size: int = BULK_MAX_PACKET_SIZE,
+                          connection=None):
+        updated_rows = 0
+        updated_keys = []
+        header_size = len(self._query_builder.bulk_update(table=table, key_column=key_column, columns=columns,
+                                                          rows_count=1).encode('utf-8'))
+        case_size = len(' WHEN  THEN ')
+
+        def row_size(row):
+            return bulk_update_row_size(row, key_size=value_size(row[0]), overhead=case_size)
+
+        async with self.connection(connection) as conn:
+            async with conn.cursor() as cur:
+                for chunk in chunk_rows(rows, max_rows, max_packet_size, header_size=header_size, row_size=row_size):
+                    values = []
+                    for column_index in range(1, len(columns) + 1):
+                        for row in chunk:
+                            values.append(row[0])
+                            values.append(row[column_index])
+                    chunk_keys = [row[0] for row in chunk]
+                    values.extend(chunk_keys)
+                    await cur.execute(self._query_builder.bulk_update(table=table, key_column=key_column,
+                                                                      columns=columns, rows_count=len(chunk)),
+                                      values)
+                    updated_rows += cur.rowcount
+                    updated_keys.extend(chunk_keys)
+        self._notify_update(table, {key_column: updated_keys})
+        return updated_rows
+
+    async def update(self, table: str, columns: list, values: list, condition, connection=None):
+        async with self.transaction(connection) as conn:
+            found_objs = await self.filter(table=table, columns=columns, condition=condition, connection=conn)
             if len(found_objs) == 0:
                 raise ObjectDoesNotExist('Object to update does not exist')
-            else:
-                update_list = ','.join(col + '=' + "'" + str(val) + "'" for col, val in zip(columns, values))
-                await cur.execute(f'UPDATE `{table}` SET {update_list} WHERE {condition}')
-                await conn.commit()
-        self.release_connection(conn)
-
-    async def update_or_create(self, table: str, columns: list, values: list, condition: str):
-        found_objs, conn = await self.filter(table=table, columns=columns, condition=condition, close_connection=False)
-        if len(found_objs) == 0:
-            await self.create(table=table, columns=columns, values=values, connection=conn)
-        else:
-            await self.update(table=table, columns=columns, values=values, condition=condition, connection=conn)
+            async with conn.cursor() as cur:
+                await cur.execute(*self._query_builder.update(table=table, columns=columns, values=values,
+                                                              condition=condition))
+        self._notify_update(table, condition)
+
+    async def delete(self, table: str, condition, connection=None):
+        async with self.transaction(connection) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(*self._query_builder.delete(table=table, condition=condition))
+        self._notify_update(table, condition)
+
+    async def update_or_create(self, table: str, columns: list, values: list, connection=None):
+        async with self.connection(connection) as conn:
+            affected_rows, _ = await self.__insert(conn, table, columns, values, update_columns=columns)
+        if affected_rows != 1:
+            self._notify_update(table)
+        return affected_rows == 1
 
 
 class LanguagesDatabase(Database):
     def __init__(self, related_common_db, lang_db=None, *args, **kwargs):
         lang_db = related_common_db + '_langs' if lang_db is None else lang_db
         self.__related_common_db = related_common_db
+        self._translations_cache = VersionedCache(name='translations', max_size=TRANSLATIONS_CACHE_MAX_SIZE)
+        self._translations_table = None
+        self._translations_lock = asyncio.Lock()
+        self._langs_registry = LanguagesRegistry(ttl=LANGUAGES_REGISTRY_TTL)
         super(LanguagesDatabase, self).__init__(db=lang_db, *args, **kwargs)
 
-    async def get_text_content(self, dict_of_codenames: dict, lang_code: str, include_content_ids: bool = False):
-        result = dict()
-        async with self._connection_pool.acquire() as conn:
+    async def __fetch_translations_version(self):
+        async with self.connection() as conn:
             async with conn.cursor() as cur:
-                for table_type in dict_of_codenames:
-                    list_of_codenames = ','.join('"' + name + '"' for name in dict_of_codenames[table_type])
-                    db_content_table = f'{self.__related_common_db}.{table_type}'
-                    query = 'SELECT codename, translation, original_text'
-                    if include_content_ids:
-                        query += f', {db_content_table}.text_content_id'
-
-                    query += f' FROM translations ' \
-                             f'JOIN languages langs on translations.lang_id = langs.id ' \
-                             f'RIGHT JOIN {db_content_table} cont_table on translations.text_content_id = cont_table.text_content_id AND langs.lang_code="{lang_code}" ' \
-                             f'LEFT JOIN text_content ON text_content.id=cont_table.text_content_id AND original_lang_id=(SELECT id FROM languages WHERE lang_code="{lang_code}") ' \
-                             f'WHERE codename in ({list_of_codenames}) ' \
-                             f'ORDER BY cont_table.text_content_id'
+                try:
+                    await cur.execute('SELECT version FROM translations_version WHERE id=1')
+                    version_row = await cur.fetchone()
+                    return 0 if version_row is None else version_row[0]
+                except ProgrammingError:
+                    return None
+
+    async def __build_translations_table(self):
+        translations_table = TranslationsTable()
+        async with self.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT table_name FROM information_schema.columns "
+                                  "WHERE table_schema=%s AND column_name IN ('codename', 'text_content_id') "
+                                  "GROUP BY table_name HAVING COUNT(*)=2", (self.__related_common_db,))
+                content_tables = [row[0] for row in await cur.fetchall()]
+            if content_tables:
+                query = ' UNION ALL '.join(
+                    f"SELECT langs.lang_code, '{table_type}', cont_table.codename, cont_table.text_content_id, "
+                    f"IFNULL(text_content.original_text, translations.translation) "
+                    f"FROM languages langs "
+                    f"CROSS JOIN {quote_identifier(f'{self.__related_common_db}.{table_type}')} cont_table "
+                    f"LEFT JOIN translations ON translations.text_content_id=cont_table.text_content_id "
+                    f"AND translations.lang_id=langs.id "
+                    f"LEFT JOIN text_content ON text_content.id=cont_table.text_content_id "
+                    f"AND text_content.original_lang_id=langs.id"
+                    for table_type in content_tables)
+                async with conn.cursor(SSCursor) as cur:
                     await cur.execute(query)
-                    result_content = list(await cur.fetchall())
-                    cur_type_text_content = {row[0]: row[1] if row[2] is None else row[2] for row in result_content}
-
-                    if include_content_ids:
-                        result_content = np.asarray(result_content)
-                        text_content_ids = result_content[:, 2].astype('int')
-                        result[table_type] = dict()
-                        result[table_type]['content'] = cur_type_text_content
-                        result[table_type]['content_ids'] = text_content_ids
-                    else:
-                        result[table_type] = cur_type_text_content
+                    while True:
+                        rows = await cur.fetchmany(1000)
+                        if not rows:
+                            break
+                        for row in rows:
+                            translations_table.add_row(*row)
+        return translations_table.freeze()
+
+    async def check_translations_version(self):
+        async with self._translations_lock:
+            version = await self.__fetch_translations_version()
+            if version == self._translations_cache.version:
+                return False
+            if self._translations_table is not None:
+                self._translations_table = await self.__build_translations_table()
+            self._translations_cache.update_version(version)
+            return True
+
+    async def load_all_translations(self, check_version: bool = True):
+        async with self._translations_lock:
+            version = await self.__fetch_translations_version() if check_version else None
+            self._translations_table = await self.__build_translations_table()
+            if check_version:
+                self._translations_cache.update_version(version)
+        return len(self._translations_table)
+
+    async def get_text_content(self, dict_of_codenames: dict, lang_code: str, include_content_ids: bool = False):
+        result = dict()
+        not_cached_table_types = []
+        for table_type in dict_of_codenames:
+            if self._translations_table is not None:
+                loaded_content = self._translations_table.lookup(lang_code, table_type,
+                                                                 dict_of_codenames[table_type], include_content_ids)
+                if loaded_content is not None:
+                    result[table_type] = loaded_content
+                    continue
+            cache_key = (lang_code, table_type, frozenset(dict_of_codenames[table_type]), include_content_ids)
+            cached_content = self._translations_cache.get(cache_key)
+            if cached_content is None:
+                not_cached_table_types.append(table_type)
+            else:
+                result[table_type] = cached_content
+
+        if not_cached_table_types:
+            async with self.connection() as conn:
+                async with conn.cursor() as cur:
+                    for table_type in not_cached_table_types:
+                        codenames = list(dict_of_codenames[table_type])
+                        db_content_table = quote_identifier(f'{self.__related_common_db}.{table_type}')
+                        query = 'SELECT codename, translation, original_text'
+                        if include_content_ids:
+                            query += ', cont_table.text_content_id'
+
+                        query += f' FROM translations ' \
+                                 f'JOIN languages langs on translations.lang_id = langs.id ' \
+                                 f'RIGHT JOIN {db_content_table} cont_table on translations.text_content_id = cont_table.text_content_id AND langs.lang_code=%s ' \
+                                 f'LEFT JOIN text_content ON text_content.id=cont_table.text_content_id AND original_lang_id=(SELECT id FROM languages WHERE lang_code=%s) ' \
+                                 f'WHERE codename in ({",".join(["%s"] * len(codenames))}) ' \
+                                 f'ORDER BY cont_table.text_content_id'
+                        await cur.execute(query, [lang_code, lang_code] + codenames)
+                        result_content = list(await cur.fetchall())
+                        cur_type_text_content = {row[0]: row[1] if row[2] is None else row[2] for row in result_content}
+
+                        if include_content_ids:
+                            text_content_ids = [int(row[3]) for row in result_content]
+                            result[table_type] = dict()
+                            result[table_type]['content'] = cur_type_text_content
+                            result[table_type]['content_ids'] = text_content_ids
+                        else:
+                            result[table_type] = cur_type_text_content
+                        cache_key = (lang_code, table_type, frozenset(dict_of_codenames[table_type]),
+                                     include_content_ids)
+                        self._translations_cache.set(cache_key, result[table_type])
+        if len(result) > 1:
+            result = {table_type: result[table_type] for table_type in dict_of_codenames}
         if len(result) == 1:
             result_list = list(result.values())[0]
             if len(result_list) == 1:
@@ -247,14 +502,39 @@ class LanguagesDatabase(Database):
         else:
             return result
 
+    async def refresh_langs(self):
+        self._langs_registry.update(await self.filter(table='languages', columns=['id', 'lang_code', 'lang_name']))
+
     async def get_all_langs(self):
-        return {lang_info[0]: lang_info[1] for lang_info in await self.filter(table='languages', columns=['lang_code', 'lang_name'])}
+        if self._langs_registry.is_expired():
+            await self.refresh_langs()
+        return self._langs_registry.langs
 
     async def get_all_lang_codes(self):
         return (await self.get_all_langs()).keys()
 
     async def get_all_lang_ids(self):
-        async with self._connection_pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute(f'SELECT id FROM `languages` ORDER BY id')
-                return np.asarray(list(await cur.fetchall())).reshape(-1).tolist()
+        if self._langs_registry.is_expired():
+            await self.refresh_langs()
+        return list(self._langs_registry.lang_ids)
+
+    async def get_lang_ids_by_code(self):
+        if self._langs_registry.is_expired():
+            await self.refresh_langs()
+        return self._langs_registry.lang_ids_by_code
+
+
+class MigrationsWatcher:
+    def __init__(self, migrations_db: Database, databases: list):
+        self.migrations_db = migrations_db
+        self.databases = databases
+        self.version = None
+
+    async def check(self):
+        version = await self.migrations_db.get_migrations_version()
+        if version != self.version:
+            for database in self.databases:
+                database.refresh_tables_metadata()
+            if self.version is not None:
+                logger.info('New migrations are applied, tables metadata is refreshed')
+        self.version = version
@@ -16,3 +16,7 @@ class ConnectionPoolDoesNotExist(Exception):
 
 class InternalDatabaseError(Exception):
     pass
+
+
+class ConnectionAcquireTimeout(Exception):
+    pass
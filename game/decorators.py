@@ -1,14 +1,22 @@
+from functools import wraps
 from inspect import iscoroutinefunction
 
 from pymysql import OperationalError
 
-from game.database_exceptions import ConnectionPoolCannotBeCreated, ConnectionPoolDoesNotExist, InternalDatabaseError
+from game.database_exceptions import ConnectionPoolCannotBeCreated, ConnectionPoolDoesNotExist, InternalDatabaseError, \
+    ObjectDoesNotExist, MultipleObjectsExist, ConnectionAcquireTimeout
+
+PASSED_DATABASE_ERRORS = (ObjectDoesNotExist, MultipleObjectsExist, ConnectionAcquireTimeout, InternalDatabaseError,
+                          ConnectionPoolDoesNotExist, ConnectionPoolCannotBeCreated)
 
 
 def database_errors_handler(fun):
+    @wraps(fun)
     async def async_wrapper(*args, **kwargs):
         try:
             return await fun(*args, **kwargs)
+        except PASSED_DATABASE_ERRORS:
+            raise
         except (AttributeError, NameError):
             raise ConnectionPoolDoesNotExist('Connection pool does not exist')
         except OperationalError as ex:
@@ -16,9 +24,12 @@ def database_errors_handler(fun):
         except Exception as other_ex:
             raise InternalDatabaseError(f'Internal database error: {other_ex}')
 
+    @wraps(fun)
     def sync_wrapper(*args, **kwargs):
         try:
             return fun(*args, **kwargs)
+        except PASSED_DATABASE_ERRORS:
+            raise
         except (AttributeError, NameError):
             raise ConnectionPoolDoesNotExist('Connection pool does not exist')
         except OperationalError as ex:
@@ -33,6 +44,8 @@ def database_errors_handler(fun):
                 return await fun(*args, **kwargs)
             else:
                 return fun(*args, **kwargs)
+        except PASSED_DATABASE_ERRORS:
+            raise
         except (AttributeError, NameError):
             raise ConnectionPoolDoesNotExist('Connection pool does not exist')
         except OperationalError as ex:
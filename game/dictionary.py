@@ -0,0 +1,314 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+
+from game.dictionary_exceptions import DictionaryDoesNotExist, InvalidDictionaryFile
+from game.metrics import Gauge
+from settings import DICTIONARIES_FOLDER
+
+DICTIONARY_MAGIC = b'WGDAWG01'
+DICTIONARY_HEADER = struct.Struct('<8sIII')
+DICTIONARY_FILE_EXTENSION = 'dawg'
+WORDS_FILE_EXTENSION = 'txt'
+
+
+def normalize_word(word: str):
+    return word.strip().lower()
+
+
+class DictionaryBuilder:
+    class Node:
+        __slots__ = ('is_final', 'edges')
+
+        def __init__(self):
+            self.is_final = False
+            self.edges = {}
+
+        def key(self):
+            return self.is_final, tuple((label, id(child)) for label, child in sorted(self.edges.items()))
+
+    def __init__(self):
+        self.root = self.Node()
+        self._previous_word = ''
+        self._unchecked_nodes = []
+        self._minimized_nodes = {}
+        self.words_count = 0
+
+    def __minimize(self, down_to: int):
+        while len(self._unchecked_nodes) > down_to:
+            parent, label, child = self._unchecked_nodes.pop()
+            key = child.key()
+            minimized_child = self._minimized_nodes.get(key)
+            if minimized_child is None:
+                self._minimized_nodes[key] = child
+            else:
+                parent.edges[label] = minimized_child
+
+    def add(self, word: str):
+        if word <= self._previous_word:
+            if word == self._previous_word:
+                return
+            raise ValueError('Words must be added in sorted order')
+        common_prefix_length = 0
+        for previous_letter, letter in zip(self._previous_word, word):
+            if previous_letter != letter:
+                break
+            common_prefix_length += 1
+        self.__minimize(common_prefix_length)
+
+        node = self._unchecked_nodes[-1][2] if self._unchecked_nodes else self.root
+        for letter in word[common_prefix_length:]:
+            child = self.Node()
+            node.edges[letter] = child
+            self._unchecked_nodes.append((node, letter, child))
+            node = child
+        node.is_final = True
+        self._previous_word = word
+        self.words_count += 1
+
+    def finish(self):
+        self.__minimize(0)
+        node_ids = {id(self.root): 0}
+        nodes = [self.root]
+        for node in nodes:
+            for _, child in sorted(node.edges.items()):
+                if id(child) not in node_ids:
+                    node_ids[id(child)] = len(nodes)
+                    nodes.append(child)
+
+        words_counts = [None] * len(nodes)
+        stack = [0]
+        while stack:
+            node_id = stack[-1]
+            children_ids = [node_ids[id(child)] for child in nodes[node_id].edges.values()]
+            not_counted_ids = [child_id for child_id in children_ids if words_counts[child_id] is None]
+            if not_counted_ids:
+                stack.extend(not_counted_ids)
+                continue
+            stack.pop()
+            words_counts[node_id] = int(nodes[node_id].is_final) + sum(words_counts[child_id]
+                                                                       for child_id in children_ids)
+
+        first_edges, finals = array('I'), array('I')
+        edge_labels, edge_targets = array('I'), array('I')
+        for node in nodes:
+            first_edges.append(len(edge_labels))
+            finals.append(int(node.is_final))
+            for label, child in sorted(node.edges.items()):
+                edge_labels.append(ord(label))
+                edge_targets.append(node_ids[id(child)])
+        first_edges.append(len(edge_labels))
+        return first_edges, finals, array('I', words_counts), edge_labels, edge_targets
+
+    def to_bytes(self):
+        first_edges, finals, words_counts, edge_labels, edge_targets = self.finish()
+        if sys.byteorder != 'little':
+            for values in (first_edges, finals, words_counts, edge_labels, edge_targets):
+                values.byteswap()
+        header = DICTIONARY_HEADER.pack(DICTIONARY_MAGIC, len(finals), len(edge_labels), self.words_count)
+        return b''.join([header, first_edges.tobytes(), finals.tobytes(), words_counts.tobytes(),
+                         edge_labels.tobytes(), edge_targets.tobytes()])
+
+
+class Dictionary:
+    def __init__(self, buffer, lang_code: str = None):
+        self.lang_code = lang_code
+        self._buffer = buffer
+        if len(buffer) < DICTIONARY_HEADER.size:
+            raise InvalidDictionaryFile('Dictionary file is too short')
+        magic, nodes_count, edges_count, self.words_count = DICTIONARY_HEADER.unpack_from(buffer)
+        if magic != DICTIONARY_MAGIC:
+            raise InvalidDictionaryFile('Dictionary file has wrong format')
+        if sys.byteorder != 'little':
+            raise InvalidDictionaryFile('Dictionary files can be mapped on little-endian machines only')
+        sizes = (nodes_count + 1, nodes_count, nodes_count, edges_count, edges_count)
+        if len(buffer) != DICTIONARY_HEADER.size + 4 * sum(sizes):
+            raise InvalidDictionaryFile('Dictionary file is truncated')
+        view = memoryview(buffer)[DICTIONARY_HEADER.size:].cast('I')
+        arrays = []
+        offset = 0
+        for size in sizes:
+            arrays.append(view[offset:offset + size])
+            offset += size
+        self._first_edges, self._finals, self._words_counts, self._edge_labels, self._edge_targets = arrays
+
+    @classmethod
+    def from_words(cls, words, lang_code: str = None):
+        builder = DictionaryBuilder()
+        for word in sorted({normalize_word(word) for word in words} - {''}):
+            builder.add(word)
+        return cls(builder.to_bytes(), lang_code=lang_code)
+
+    @classmethod
+    def load(cls, path: str, lang_code: str = None):
+        with open(path, 'rb') as dictionary_file:
+            buffer = mmap.mmap(dictionary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, lang_code=lang_code)
+
+    def __len__(self):
+        return self.words_count
+
+    def __contains__(self, word: str):
+        node = self.find_node(word)
+        return node is not None and self._finals[node] == 1
+
+    @property
+    def nodes_count(self):
+        return len(self._finals)
+
+    @property
+    def size(self):
+        return len(self._buffer)
+
+    def child(self, node: int, letter: str):
+        label = ord(letter)
+        low, high = self._first_edges[node], self._first_edges[node + 1]
+        edge_labels = self._edge_labels
+        while low < high:
+            middle = (low + high) // 2
+            middle_label = edge_labels[middle]
+            if middle_label < label:
+                low = middle + 1
+            elif middle_label > label:
+                high = middle
+            else:
+                return self._edge_targets[middle]
+        return None
+
+    def edges(self, node: int):
+        first_edge, last_edge = self._first_edges[node], self._first_edges[node + 1]
+        return zip(self._edge_labels[first_edge:last_edge], self._edge_targets[first_edge:last_edge])
+
+    def is_final(self, node: int):
+        return self._finals[node] == 1
+
+    def words_below(self, node: int):
+        return self._words_counts[node]
+
+    def alphabet(self):
+        return sorted(set(map(chr, self._edge_labels)))
+
+    def find_node(self, prefix: str):
+        node = 0
+        for letter in prefix:
+            node = self.child(node, letter)
+            if node is None:
+                return None
+        return node
+
+    def has_prefix(self, prefix: str):
+        return self.find_node(prefix) is not None
+
+    def count_prefix(self, prefix: str):
+        node = self.find_node(prefix)
+        return 0 if node is None else self._words_counts[node]
+
+    def index(self, word: str):
+        node, word_index = 0, 0
+        for letter in word:
+            label = ord(letter)
+            if self._finals[node]:
+                word_index += 1
+            for edge_label, target in self.edges(node):
+                if edge_label == label:
+                    node = target
+                    break
+                word_index += self._words_counts[target]
+            else:
+                return None
+        return word_index if self._finals[node] else None
+
+    def word(self, word_index: int):
+        if not 0 <= word_index < self.words_count:
+            return None
+        first_edges, finals, words_counts = self._first_edges, self._finals, self._words_counts
+        edge_labels, edge_targets = self._edge_labels, self._edge_targets
+        node, letters = 0, []
+        while True:
+            if finals[node]:
+                if word_index == 0:
+                    return ''.join(letters)
+                word_index -= 1
+            for edge in range(first_edges[node], first_edges[node + 1]):
+                target = edge_targets[edge]
+                if word_index < words_counts[target]:
+                    letters.append(chr(edge_labels[edge]))
+                    node = target
+                    break
+                word_index -= words_counts[target]
+
+    def words(self, prefix: str = '', limit: int = None):
+        node = self.find_node(prefix)
+        if node is None:
+            return
+        stack = [(node, prefix)]
+        found = 0
+        while stack:
+            node, word = stack.pop()
+            if self._finals[node]:
+                yield word
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+            stack.extend((target, word + chr(label)) for label, target in reversed(list(self.edges(node))))
+
+
+class DictionariesRegistry:
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._dictionaries = {}
+        self._lock = threading.Lock()
+        Gauge('dictionaries_loaded', 'Word dictionaries mapped into memory', function=self.__len__)
+
+    def __len__(self):
+        return len(self._dictionaries)
+
+    def path(self, lang_code: str, extension: str = DICTIONARY_FILE_EXTENSION):
+        return os.path.join(self.folder, f'{lang_code}.{extension}')
+
+    def get(self, lang_code: str):
+        dictionary = self._dictionaries.get(lang_code)
+        if dictionary is None:
+            with self._lock:
+                dictionary = self._dictionaries.get(lang_code)
+                if dictionary is None:
+                    try:
+                        dictionary = Dictionary.load(self.path(lang_code), lang_code=lang_code)
+                    except FileNotFoundError:
+                        raise DictionaryDoesNotExist(f'Dictionary for language "{lang_code}" is not built')
+                    self._dictionaries[lang_code] = dictionary
+        return dictionary
+
+    def reload(self, lang_code: str = None):
+        with self._lock:
+            if lang_code is None:
+                self._dictionaries.clear()
+            else:
+                self._dictionaries.pop(lang_code, None)
+
+    def available_lang_codes(self, extension: str = DICTIONARY_FILE_EXTENSION):
+        try:
+            filenames = os.listdir(self.folder)
+        except FileNotFoundError:
+            return []
+        return sorted(filename[:-len(extension) - 1] for filename in filenames
+                      if filename.endswith(f'.{extension}'))
+
+    def build(self, lang_code: str):
+        with open(self.path(lang_code, WORDS_FILE_EXTENSION), 'r', encoding='utf-8') as words_file:
+            words = sorted({normalize_word(word) for word in words_file} - {''})
+        builder = DictionaryBuilder()
+        for word in words:
+            builder.add(word)
+        temporary_path = self.path(lang_code) + '.tmp'
+        with open(temporary_path, 'wb') as dictionary_file:
+            dictionary_file.write(builder.to_bytes())
+        os.replace(temporary_path, self.path(lang_code))
+        self.reload(lang_code)
+        return builder.words_count
+
+
+dictionaries = DictionariesRegistry(DICTIONARIES_FOLDER)
@@ -0,0 +1,6 @@
+class DictionaryDoesNotExist(Exception):
+    pass
+
+
+class InvalidDictionaryFile(Exception):
+    pass
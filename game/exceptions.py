@@ -1,4 +1,4 @@
-from werkzeug.exceptions import HTTPException
+from werkzeug.exceptions import HTTPException, ServiceUnavailable
 
 
 class ObjectNotFound(HTTPException):
@@ -8,3 +8,11 @@ class ObjectNotFound(HTTPException):
     def __init__(self, obj, obj_name):
         self.obj = obj
         self.obj_name = obj_name
+
+
+class HashingQueueIsFull(ServiceUnavailable):
+    description = 'Too many passwords are being checked right now. Try again later'
+
+
+class SourceWordsNotAvailable(ServiceUnavailable):
+    description = 'There are no source words for this language and difficulty yet'
@@ -0,0 +1,71 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from game.exceptions import HashingQueueIsFull
+from game.metrics import Counter, Gauge
+from settings import HASHING_EXECUTOR_TYPE, HASHING_MAX_WORKERS, HASHING_MAX_QUEUE_DEPTH
+
+
+def check_password_sync(password: bytes, password_hash: bytes):
+    import bcrypt
+    return bcrypt.checkpw(password, password_hash)
+
+
+def hash_password_sync(password: bytes):
+    import bcrypt
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+class HashingExecutor:
+    executor_classes = {
+        'thread': ThreadPoolExecutor,
+        'process': ProcessPoolExecutor,
+    }
+
+    def __init__(self, executor_type: str, max_workers: int, max_queue_depth: int):
+        if executor_type not in self.executor_classes:
+            raise ValueError(f'Unknown hashing executor type "{executor_type}"')
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._executor = None
+        self._pending_jobs = 0
+        Gauge('hashing_jobs_in_flight', 'Hashing jobs being executed', function=self.in_flight_jobs)
+        Gauge('hashing_jobs_queued', 'Hashing jobs waiting for a free worker', function=self.queued_jobs)
+        self.rejected_jobs = Counter('hashing_jobs_rejected_total', 'Hashing jobs rejected because the queue was full')
+
+    def in_flight_jobs(self):
+        return min(self._pending_jobs, self.max_workers)
+
+    def queued_jobs(self):
+        return max(self._pending_jobs - self.max_workers, 0)
+
+    def start(self):
+        if self._executor is None:
+            self._executor = self.executor_classes[self.executor_type](max_workers=self.max_workers)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fun, *args):
+        if self._pending_jobs >= self.max_workers + self.max_queue_depth:
+            self.rejected_jobs.inc()
+            raise HashingQueueIsFull(retry_after=1)
+        self.start()
+        self._pending_jobs += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fun, *args)
+        finally:
+            self._pending_jobs -= 1
+
+    async def check_password(self, password: str, password_hash: str):
+        return await self.run(check_password_sync, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    async def hash_password(self, password: str):
+        return (await self.run(hash_password_sync, password.encode('utf-8'))).decode('utf-8')
+
+
+hashing_executor = HashingExecutor(executor_type=HASHING_EXECUTOR_TYPE, max_workers=HASHING_MAX_WORKERS,
+                                   max_queue_depth=HASHING_MAX_QUEUE_DEPTH)
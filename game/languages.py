@@ -0,0 +1,25 @@
+import time
+from types import MappingProxyType
+
+from game.metrics import Counter
+
+
+class LanguagesRegistry:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.langs = MappingProxyType({})
+        self.lang_ids = ()
+        self.lang_ids_by_code = MappingProxyType({})
+        self._refreshed_at = None
+        self.refreshes = Counter('languages_registry_refreshes_total', 'Refreshes of the process-wide languages list')
+
+    def is_expired(self):
+        return (self._refreshed_at is None) or (time.monotonic() - self._refreshed_at >= self.ttl)
+
+    def update(self, languages_rows):
+        languages_rows = sorted(languages_rows)
+        self.langs = MappingProxyType({lang_code: lang_name for _, lang_code, lang_name in languages_rows})
+        self.lang_ids = tuple(lang_id for lang_id, _, _ in languages_rows)
+        self.lang_ids_by_code = MappingProxyType({lang_code: lang_id for lang_id, lang_code, _ in languages_rows})
+        self._refreshed_at = time.monotonic()
+        self.refreshes.inc()
@@ -0,0 +1,120 @@
+import threading
+
+metrics_registry = {}
+
+
+class Metric:
+    metric_type = 'untyped'
+
+    def __new__(cls, name: str, description: str = '', labels: dict = None, *args, **kwargs):
+        key = (name, tuple(sorted((labels or {}).items())))
+        if key not in metrics_registry:
+            metric = super(Metric, cls).__new__(cls)
+            metric._initialized = False
+            metrics_registry[key] = metric
+        return metrics_registry[key]
+
+    def __init__(self, name: str, description: str = '', labels: dict = None):
+        if self._initialized:
+            return
+        self._initialized = True
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self._lock = threading.Lock()
+
+    def labels_str(self, extra_labels: dict = None):
+        labels = {**self.labels, **(extra_labels or {})}
+        if not labels:
+            return ''
+        return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
+
+    def samples(self):
+        return []
+
+
+class Counter(Metric):
+    metric_type = 'counter'
+
+    def __init__(self, name: str, description: str = '', labels: dict = None):
+        super(Counter, self).__init__(name, description, labels)
+        if not hasattr(self, 'value'):
+            self.value = 0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        return [(self.name, self.labels_str(), self.value)]
+
+
+class Gauge(Metric):
+    metric_type = 'gauge'
+
+    def __init__(self, name: str, description: str = '', labels: dict = None, function=None):
+        super(Gauge, self).__init__(name, description, labels)
+        if not hasattr(self, 'value'):
+            self.value = 0
+        if function is not None:
+            self.function = function
+        elif not hasattr(self, 'function'):
+            self.function = None
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def samples(self):
+        value = self.value if self.function is None else self.function()
+        return [(self.name, self.labels_str(), value)]
+
+
+class Histogram(Metric):
+    metric_type = 'histogram'
+    default_buckets = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name: str, description: str = '', labels: dict = None, buckets: tuple = None):
+        super(Histogram, self).__init__(name, description, labels)
+        if not hasattr(self, 'buckets'):
+            self.buckets = tuple(sorted(buckets or self.default_buckets))
+            self.bucket_counts = [0] * len(self.buckets)
+            self.count = 0
+            self.sum = 0
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bucket in enumerate(self.buckets):
+                if value <= bucket:
+                    self.bucket_counts[i] += 1
+
+    def samples(self):
+        samples = [(f'{self.name}_bucket', self.labels_str({'le': bucket}), bucket_count)
+                   for bucket, bucket_count in zip(self.buckets, self.bucket_counts)]
+        samples.append((f'{self.name}_bucket', self.labels_str({'le': '+Inf'}), self.count))
+        samples.append((f'{self.name}_count', self.labels_str(), self.count))
+        samples.append((f'{self.name}_sum', self.labels_str(), self.sum))
+        return samples
+
+
+def export_metrics():
+    lines = []
+    described_metrics = set()
+    for metric in sorted(metrics_registry.values(), key=lambda m: m.name):
+        if metric.name not in described_metrics:
+            described_metrics.add(metric.name)
+            if metric.description:
+                lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.metric_type}')
+        for sample_name, sample_labels, sample_value in metric.samples():
+            lines.append(f'{sample_name}{sample_labels} {sample_value}')
+    return '\n'.join(lines) + '\n'
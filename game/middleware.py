@@ -19,17 +19,21 @@
 #             scope['headers'] = new_headers  # Headers(new_headers)
 #         print(await self.app(scope, receive, send))
 #         return await self.app(scope, receive, send)
+import hmac
 import re
 import secrets
 
-import bcrypt
-
-from game.constants import PATHS_WITHOUT_LOGIN, DEFAULT_LANG_CODE
+from game.constants import PATHS_WITHOUT_LOGIN, DEFAULT_LANG_CODE, AUTH_TOKEN_COOKIE, METRICS_PATH
 from quart import redirect, url_for, make_response, abort
 
 from game.cookies import get_or_create_cookie, get_cookie, set_cookie
-from game.database_exceptions import ObjectDoesNotExist
-from settings import db, lang_db
+from game.sessions import sessions
+from game.signing import verify_csrf_token
+from game.users import make_user_loader
+from game.write_behind import session_writes
+from settings import lang_db, METRICS_TOKEN, METRICS_ALLOWED_IPS
+
+FILE_PATH_RE = re.compile('(\.css$)|(\.js$)|(\.ico$)|(\.jpg$)|(\.png$)')
 
 
 async def security_middleware(response, **kwargs):
@@ -46,56 +50,57 @@ async def session_middleware(request, response):
     if get_cookie(request=request, key='session') is not None:
         new_session_key = secrets.token_hex(32)
         set_cookie(response=response, key='session', value=new_session_key)
-        await db.create(table='session', columns=['session_key'], values=[new_session_key])
+        session_writes.append((new_session_key,))
     return response
 
 
 async def path_is_file_middleware(request, request_vars):
-    request_vars.path_is_file = (re.search('(\.css$)|(\.js$)|(\.ico$)|(\.jpg$)|(\.png$)', request.path) is not None)
+    request_vars.path_is_file = (FILE_PATH_RE.search(request.path) is not None)
 
 
 async def login_middleware(request, request_vars):
     if not request_vars.path_is_file:
-        cookies = request.cookies
-        username = cookies.get('username')
-        password_hashed_hash = cookies.get('password')
-
-        if (username is None) or (password_hashed_hash is None):
-            request_vars.is_authorized = False
-        else:
-            try:
-                user_password_hash = await db.get(table='user', columns=['password'], condition=f'name="{username}"')
-                request_vars.is_authorized = bcrypt.checkpw(user_password_hash.encode('utf-8'),
-                                                            password_hashed_hash.encode('utf-8'))
-            except ObjectDoesNotExist:
-                request_vars.is_authorized = False
+        auth_token = get_cookie(request=request, key=AUTH_TOKEN_COOKIE)
+        request_vars.username = None if auth_token is None else await sessions.validate(auth_token)
+        request_vars.is_authorized = request_vars.username is not None
     else:
+        request_vars.username = None
         request_vars.is_authorized = None
 
 
+def metrics_access_allowed(request):
+    if request.remote_addr in METRICS_ALLOWED_IPS:
+        return True
+    authorization = request.headers.get('Authorization', '').encode('utf-8', 'surrogateescape')
+    return METRICS_TOKEN is not None and hmac.compare_digest(authorization, f'Bearer {METRICS_TOKEN}'.encode('utf-8'))
+
+
 async def login_required_middleware(request, request_vars):
+    if request.path == METRICS_PATH and metrics_access_allowed(request):
+        return
     if (request.path not in PATHS_WITHOUT_LOGIN) and (not request_vars.path_is_file) and (not request_vars.is_authorized):
         result_response = await make_response(redirect(url_for('login', next=request.path)))
         return result_response
 
 
-async def csrf_middleware(request, response):
-    get_or_create_cookie(request=request, key='csrf_token', value=secrets.token_hex(32), response=response)
+async def csrf_middleware(request, request_vars, response):
+    new_csrf_token = request_vars.get('csrf_cookie_token') or secrets.token_hex(32)
+    get_or_create_cookie(request=request, key='csrf_token', value=new_csrf_token, response=response)
     return response
 
 
 async def form_protection_middleware(request):
     request_form = await request.form
-    if len(request_form) != 0:
-        form_csrf_token = request_form.get('csrf_token').encode('utf-8')
-        cookies_csrf_token = request.cookies.get('csrf_token').encode('utf-8')
-        if (form_csrf_token is None) or (not bcrypt.checkpw(cookies_csrf_token, form_csrf_token)):
+    if request.method == 'POST' or len(request_form) != 0:
+        form_csrf_token = request_form.get('csrf_token')
+        cookies_csrf_token = request.cookies.get('csrf_token')
+        if (form_csrf_token is None) or (cookies_csrf_token is None) or \
+                (not verify_csrf_token(cookies_csrf_token, form_csrf_token)):
             abort(403, 'CSRF verification failed. Request aborted.')
 
 
 async def languages_middleware(request, request_vars):
-    if 'all_langs' not in request_vars:
-        request_vars.all_langs = await lang_db.get_all_langs()
+    request_vars.all_langs = await lang_db.get_all_langs()
     lang_from_cookies = get_cookie(request, 'lang')
     if lang_from_cookies is None:
         request_vars.lang = DEFAULT_LANG_CODE
@@ -108,5 +113,9 @@ async def detect_language_middleware(request_vars, response):
     set_cookie(response=response, key='lang', value=request_vars.lang)
 
 
+def user_loader_middleware(request_vars):
+    request_vars.user_loader = make_user_loader()
+
+
 def nonce_middleware(request_vars):
     request_vars.nonces = {}
@@ -0,0 +1,10 @@
+CREATE TABLE lobby_rooms (
+    room_id varchar(16) not null primary key,
+    worker_id varchar(100) not null,
+    lang_code varchar(10) not null,
+    creator varchar(255) not null,
+    difficulty varchar(10),
+    state varchar(10) not null,
+    players_count smallint unsigned not null,
+    max_players smallint unsigned not null
+);
@@ -0,0 +1,6 @@
+dependencies = [
+	'game/common/lobby_rooms'
+]
+
+operations = '''CREATE INDEX lobby_rooms_worker ON lobby_rooms (worker_id);
+'''
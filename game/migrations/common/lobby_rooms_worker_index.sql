@@ -0,0 +1 @@
+CREATE INDEX lobby_rooms_worker ON lobby_rooms (worker_id);
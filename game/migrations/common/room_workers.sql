@@ -0,0 +1,5 @@
+CREATE TABLE room_workers (
+    worker_id varchar(100) not null primary key,
+    url varchar(255) not null,
+    heartbeat_at bigint unsigned not null
+);
@@ -0,0 +1,12 @@
+dependencies = []
+
+operations = '''CREATE TABLE source_words (
+    id int unsigned not null auto_increment primary key,
+    lang_id int unsigned not null,
+    word varchar(32) not null,
+    achievable_count int unsigned not null,
+    max_score int unsigned not null,
+    difficulty tinyint unsigned not null,
+    unique (lang_id, word)
+);
+'''
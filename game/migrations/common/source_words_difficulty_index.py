@@ -0,0 +1,6 @@
+dependencies = [
+	'game/common/source_words'
+]
+
+operations = '''CREATE INDEX source_words_difficulty ON source_words (lang_id, difficulty);
+'''
@@ -0,0 +1 @@
+CREATE INDEX source_words_difficulty ON source_words (lang_id, difficulty);
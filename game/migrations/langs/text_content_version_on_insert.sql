@@ -0,0 +1,4 @@
+CREATE TRIGGER text_content_onInsert
+    AFTER INSERT
+    ON text_content FOR EACH ROW
+        INSERT INTO translations_version (id, version) VALUES (1, 1) ON DUPLICATE KEY UPDATE version = version + 1;
@@ -0,0 +1,7 @@
+dependencies = []
+
+operations = '''CREATE TABLE translations_version (
+    id tinyint unsigned not null default 1 primary key,
+    version int unsigned not null default 0
+);
+'''
\ No newline at end of file
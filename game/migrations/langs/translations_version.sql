@@ -0,0 +1,4 @@
+CREATE TABLE translations_version (
+    id tinyint unsigned not null default 1 primary key,
+    version int unsigned not null default 0
+);
@@ -0,0 +1,9 @@
+dependencies = [
+	'game/langs/translations_version'
+]
+
+operations = '''CREATE TRIGGER translations_onInsert
+    AFTER INSERT
+    ON translations FOR EACH ROW
+        INSERT INTO translations_version (id, version) VALUES (1, 1) ON DUPLICATE KEY UPDATE version = version + 1;
+'''
\ No newline at end of file
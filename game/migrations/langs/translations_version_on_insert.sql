@@ -0,0 +1,4 @@
+CREATE TRIGGER translations_onInsert
+    AFTER INSERT
+    ON translations FOR EACH ROW
+        INSERT INTO translations_version (id, version) VALUES (1, 1) ON DUPLICATE KEY UPDATE version = version + 1;
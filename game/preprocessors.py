@@ -1,25 +1,65 @@
 from quart import g, request, Response
-from settings import db, lang_db
+from settings import db, lang_db, TRANSLATIONS_WARM_LOAD, DEBUG, CONNECTION_LEAK_THRESHOLD
 
+from game.background import run_periodically, stop_background_tasks
+from game.constants import LANGUAGES_REGISTRY_TTL, TRANSLATIONS_VERSION_CHECK_INTERVAL, SOURCE_WORDS_REFRESH_INTERVAL, \
+    ROOM_REGISTRY_REFRESH_INTERVAL, MIGRATIONS_CHECK_INTERVAL, SESSIONS_SYNC_INTERVAL
 from game.context_processor import languages_context_processor, csrf_context_processor, nonce_context_processor, \
     user_data_context_processor, static_files_context_processor
+from game.database import MigrationsWatcher
+from game.hashing import hashing_executor
 from game.middleware import path_is_file_middleware, login_middleware, login_required_middleware, form_protection_middleware, \
     languages_middleware, nonce_middleware, session_middleware, csrf_middleware, security_middleware, \
-    detect_language_middleware
+    detect_language_middleware, user_loader_middleware
+from game.room_registry import room_registry
+from game.sessions import sessions
+from game.source_words import source_words
+from game.templating import warm_up_templates
+from game.write_behind import session_writes
+
+
+migrations_watcher = MigrationsWatcher(migrations_db=db, databases=[db, lang_db])
+
+
+async def report_leaked_connections():
+    for database in (db, lang_db):
+        database.report_leaked_connections(threshold=CONNECTION_LEAK_THRESHOLD)
 
 
 async def on_startup():
     await db.create_connection_pool()
     await lang_db.create_connection_pool()
+    await migrations_watcher.check()
+    hashing_executor.start()
+    session_writes.start()
+    if TRANSLATIONS_WARM_LOAD:
+        await lang_db.load_all_translations()
+    await lang_db.refresh_langs()
+    await source_words.refresh()
+    await warm_up_templates()
+    run_periodically(lang_db.refresh_langs, interval=LANGUAGES_REGISTRY_TTL / 2)
+    run_periodically(lang_db.check_translations_version, interval=TRANSLATIONS_VERSION_CHECK_INTERVAL)
+    run_periodically(sessions.sync_revocations, interval=SESSIONS_SYNC_INTERVAL)
+    run_periodically(migrations_watcher.check, interval=MIGRATIONS_CHECK_INTERVAL)
+    run_periodically(source_words.refresh, interval=SOURCE_WORDS_REFRESH_INTERVAL)
+    await room_registry.refresh()
+    run_periodically(room_registry.refresh, interval=ROOM_REGISTRY_REFRESH_INTERVAL)
+    if DEBUG:
+        run_periodically(report_leaked_connections, interval=CONNECTION_LEAK_THRESHOLD / 2)
 
 
 async def on_shutdown():
+    await session_writes.stop()
+    await stop_background_tasks()
+    await room_registry.stop()
+    hashing_executor.shutdown()
     await db.close_all_connections()
     await lang_db.close_all_connections()
 
 
 async def before_request():
     await path_is_file_middleware(request, g)
+    user_loader_middleware(g)
     await login_middleware(request, g)
     response = await login_required_middleware(request, g)
     await form_protection_middleware(request)
@@ -31,7 +71,7 @@ async def before_request():
 
 async def after_request(response: Response):
     response = await session_middleware(request, response)
-    response = await csrf_middleware(request, response)
+    response = await csrf_middleware(request, g, response)
     response = await security_middleware(response, **g.nonces)
     await detect_language_middleware(g, response)
     return response
@@ -39,7 +79,7 @@ async def after_request(response: Response):
 
 async def context_processor():
     text_content = await languages_context_processor(request_vars=g)
-    csrf_token = csrf_context_processor(request)
+    csrf_token = csrf_context_processor(request, g)
     g.nonces = nonce_context_processor()
     g.user_data = await user_data_context_processor(request, g)
     static_function = static_files_context_processor
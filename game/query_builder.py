@@ -0,0 +1,135 @@
+import re
+
+from game.cache import LRUCache
+
+IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_$]*$')
+
+
+def quote_identifier(name: str):
+    parts = str(name).split('.')
+    if not all(IDENTIFIER_RE.match(part) for part in parts):
+        raise ValueError(f'Invalid SQL identifier "{name}"')
+    return '.'.join(f'`{part}`' for part in parts)
+
+
+def condition_shape(condition):
+    if condition is None or isinstance(condition, str):
+        return condition
+    shape = []
+    for column, value in condition.items():
+        if value is None:
+            shape.append((column, 'null'))
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            shape.append((column, 'in', len(value)))
+        else:
+            shape.append((column, '='))
+    return tuple(shape)
+
+
+def condition_params(condition):
+    if condition is None or isinstance(condition, str):
+        return []
+    params = []
+    for value in condition.values():
+        if value is None:
+            continue
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            params.extend(value)
+        else:
+            params.append(value)
+    return params
+
+
+def build_condition(shape):
+    if shape is None:
+        return ''
+    if isinstance(shape, str):
+        return f' WHERE {shape}'
+    predicates = []
+    for column, kind, *size in shape:
+        column = quote_identifier(column)
+        if kind == 'null':
+            predicates.append(f'{column} IS NULL')
+        elif kind == 'in':
+            predicates.append(f'{column} IN ({",".join(["%s"] * size[0])})' if size[0] else 'FALSE')
+        else:
+            predicates.append(f'{column}=%s')
+    return ' WHERE ' + ' AND '.join(predicates) if predicates else ''
+
+
+class QueryBuilder:
+    def __init__(self, db: str, cache_max_size: int):
+        self._statements = LRUCache(name='statements', max_size=cache_max_size, labels={'db': db})
+
+    def _statement(self, shape, build):
+        statement = self._statements.get(shape)
+        if statement is None:
+            statement = build()
+            self._statements.set(shape, statement)
+        return statement
+
+    def select(self, table: str, columns: list = None, condition=None, join_tables: list = None,
+               join_conditions: list = None):
+        shape = ('select', table, None if columns is None else tuple(columns), condition_shape(condition),
+                 tuple(join_tables or ()), tuple(join_conditions or ()))
+
+        def build():
+            columns_to_select = '*' if columns is None else ','.join(quote_identifier(column) for column in columns)
+            join_part = ''.join(f' JOIN {quote_identifier(join_table)} ON {join_condition}'
+                                for join_table, join_condition in zip(join_tables or (), join_conditions or ()))
+            return f'SELECT {columns_to_select} FROM {quote_identifier(table)}{join_part}' + \
+                   build_condition(shape[3])
+
+        return self._statement(shape, build), condition_params(condition)
+
+    def insert(self, table: str, columns: list, rows_count: int = 1, ignore: bool = False,
+               update_columns: list = None, last_insert_id_column: str = None):
+        shape = ('insert', table, tuple(columns), rows_count, ignore,
+                 None if update_columns is None else tuple(update_columns), last_insert_id_column)
+
+        def build():
+            row_placeholders = '(' + ','.join(['%s'] * len(columns)) + ')'
+            statement = f'INSERT {"IGNORE " if ignore else ""}INTO {quote_identifier(table)} ' \
+                        f'({",".join(quote_identifier(column) for column in columns)}) ' \
+                        f'VALUES {",".join([row_placeholders] * rows_count)}'
+            on_duplicate_updates = []
+            if last_insert_id_column is not None:
+                id_column = quote_identifier(last_insert_id_column)
+                on_duplicate_updates.append(f'{id_column}=LAST_INSERT_ID({id_column})')
+            on_duplicate_updates += [f'{quote_identifier(column)}=VALUES({quote_identifier(column)})'
+                                     for column in update_columns or ()]
+            if on_duplicate_updates:
+                statement += ' ON DUPLICATE KEY UPDATE ' + ','.join(on_duplicate_updates)
+            return statement
+
+        return self._statement(shape, build)
+
+    def update(self, table: str, columns: list, values: list, condition):
+        shape = ('update', table, tuple(columns), condition_shape(condition))
+
+        def build():
+            update_list = ','.join(f'{quote_identifier(column)}=%s' for column in columns)
+            return f'UPDATE {quote_identifier(table)} SET {update_list}' + build_condition(shape[3])
+
+        return self._statement(shape, build), list(values) + condition_params(condition)
+
+    def bulk_update(self, table: str, key_column: str, columns: list, rows_count: int):
+        shape = ('bulk_update', table, key_column, tuple(columns), rows_count)
+
+        def build():
+            key = quote_identifier(key_column)
+            cases = ' '.join(['WHEN %s THEN %s'] * rows_count)
+            update_list = ','.join(f'{quote_identifier(column)}=CASE {key} {cases} ELSE {quote_identifier(column)} END'
+                                   for column in columns)
+            return f'UPDATE {quote_identifier(table)} SET {update_list} ' \
+                   f'WHERE {key} IN ({",".join(["%s"] * rows_count)})'
+
+        return self._statement(shape, build)
+
+    def delete(self, table: str, condition):
+        shape = ('delete', table, condition_shape(condition))
+
+        def build():
+            return f'DELETE FROM {quote_identifier(table)}' + build_condition(shape[2])
+
+        return self._statement(shape, build), condition_params(condition)
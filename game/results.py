@@ -0,0 +1,47 @@
+from functools import lru_cache
+
+
+class Record:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for column, value in zip(self.__slots__, values):
+            setattr(self, column, value)
+
+    def __iter__(self):
+        return (getattr(self, column) for column in self.__slots__)
+
+    def __getitem__(self, index):
+        return getattr(self, self.__slots__[index])
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(' + ', '.join(f'{column}={getattr(self, column)!r}'
+                                                         for column in self.__slots__) + ')'
+
+
+@lru_cache(maxsize=256)
+def record_class(columns: tuple):
+    return type('Record', (Record,), {'__slots__': columns})
+
+
+def flatten_rows(rows):
+    return [row[0] for row in rows]
+
+
+def rows_to_records(rows, columns):
+    record = record_class(tuple(columns))
+    return [record(*row) for row in rows]
+
+
+def shape_rows(rows, columns_count: int, columns: list = None, as_records: bool = False):
+    if as_records:
+        return rows_to_records(rows, columns)
+    if columns_count == 1:
+        return flatten_rows(rows)
+    return list(rows)
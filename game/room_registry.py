@@ -0,0 +1,181 @@
+import bisect
+import hashlib
+import secrets
+import time
+from types import MappingProxyType
+
+from game.constants import HASH_RING_REPLICAS, ROOM_WORKER_TTL
+from game.metrics import Counter, Gauge
+from game.rooms import rooms
+from settings import ROOM_REGISTRY_BACKEND, WORKER_ID, WORKER_URL
+
+LOBBY_ROOMS_COLUMNS = ['room_id', 'worker_id', 'lang_code', 'creator', 'difficulty', 'state', 'players_count',
+                       'max_players']
+
+
+def ring_hash(key: str):
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    def __init__(self, nodes=(), replicas: int = HASH_RING_REPLICAS):
+        self.replicas = replicas
+        self.nodes = frozenset(nodes)
+        points = sorted((ring_hash(f'{node}#{replica}'), node) for node in self.nodes for replica in range(replicas))
+        self._hashes = [point_hash for point_hash, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def node_for(self, key: str):
+        if not self._hashes:
+            return None
+        position = bisect.bisect(self._hashes, ring_hash(key)) % len(self._hashes)
+        return self._nodes[position]
+
+
+class LobbyRoom:
+    __slots__ = tuple(LOBBY_ROOMS_COLUMNS)
+
+    def __init__(self, room_id: str, worker_id: str, lang_code: str, creator: str, difficulty: str, state: str,
+                 players_count: int, max_players: int):
+        self.room_id = room_id
+        self.worker_id = worker_id
+        self.lang_code = lang_code
+        self.creator = creator
+        self.difficulty = difficulty
+        self.state = state
+        self.players_count = players_count
+        self.max_players = max_players
+
+    def __iter__(self):
+        return (getattr(self, column) for column in self.__slots__)
+
+    @classmethod
+    def from_room(cls, room, worker_id: str):
+        return cls(room.id, worker_id, room.lang_code, room.creator, room.difficulty, room.state, len(room.players),
+                   room.max_players)
+
+    def is_open(self):
+        return self.state == 'waiting' and self.players_count < self.max_players
+
+
+class InProcessBackend:
+    def __init__(self):
+        self.workers = {}
+        self.rooms = {}
+
+    async def register_worker(self, worker_id: str, url: str):
+        self.workers[worker_id] = (url, time.time())
+
+    async def unregister_worker(self, worker_id: str):
+        self.workers.pop(worker_id, None)
+        self.rooms.pop(worker_id, None)
+
+    async def live_workers(self, ttl: float):
+        return {worker_id: url for worker_id, (url, heartbeat_at) in self.workers.items()
+                if time.time() - heartbeat_at < ttl}
+
+    async def publish_rooms(self, worker_id: str, lobby_rooms):
+        self.rooms[worker_id] = list(lobby_rooms)
+
+    async def lobby_rooms(self):
+        return [lobby_room for worker_rooms in self.rooms.values() for lobby_room in worker_rooms]
+
+
+class MySQLBackend:
+    def __init__(self, database):
+        self.db = database
+
+    async def register_worker(self, worker_id: str, url: str):
+        await self.db.update_or_create(table='room_workers', columns=['worker_id', 'url', 'heartbeat_at'],
+                                       values=[worker_id, url, int(time.time())])
+
+    async def unregister_worker(self, worker_id: str):
+        async with self.db.transaction() as conn:
+            await self.db.delete(table='lobby_rooms', condition={'worker_id': worker_id}, connection=conn)
+            await self.db.delete(table='room_workers', condition={'worker_id': worker_id}, connection=conn)
+
+    async def live_workers(self, ttl: float):
+        workers = await self.db.filter(table='room_workers', columns=['worker_id', 'url', 'heartbeat_at'])
+        return {worker_id: url for worker_id, url, heartbeat_at in workers if time.time() - heartbeat_at < ttl}
+
+    async def publish_rooms(self, worker_id: str, lobby_rooms):
+        async with self.db.transaction() as conn:
+            await self.db.delete(table='lobby_rooms', condition={'worker_id': worker_id}, connection=conn)
+            await self.db.bulk_create(table='lobby_rooms', columns=LOBBY_ROOMS_COLUMNS,
+                                      rows=[tuple(lobby_room) for lobby_room in lobby_rooms], connection=conn)
+
+    async def lobby_rooms(self):
+        return [LobbyRoom(*row) for row in await self.db.filter(table='lobby_rooms', columns=LOBBY_ROOMS_COLUMNS)]
+
+
+class RoomRegistry:
+    def __init__(self, backend, worker_id: str, worker_url: str, rooms_manager, worker_ttl: float = ROOM_WORKER_TTL):
+        self.backend = backend
+        self.worker_id = worker_id
+        self.worker_url = worker_url.rstrip('/')
+        self.rooms = rooms_manager
+        self.worker_ttl = worker_ttl
+        self.ring = HashRing([worker_id])
+        self.workers = MappingProxyType({worker_id: self.worker_url})
+        self._lobby_rooms = MappingProxyType({})
+        self.refreshes = Counter('room_registry_refreshes_total', 'Refreshes of the rooms lobby snapshot')
+        Gauge('room_registry_workers', 'Live workers in the room registry hash ring', function=lambda: len(self.ring))
+        Gauge('room_registry_lobby_rooms', 'Rooms in the lobby snapshot', function=lambda: len(self._lobby_rooms))
+
+    async def refresh(self):
+        await self.backend.register_worker(self.worker_id, self.worker_url)
+        await self.backend.publish_rooms(self.worker_id, [LobbyRoom.from_room(room, self.worker_id)
+                                                          for room in list(self.rooms.rooms.values())])
+        workers = dict(await self.backend.live_workers(self.worker_ttl))
+        workers[self.worker_id] = self.worker_url
+        if set(workers) != self.ring.nodes:
+            self.ring = HashRing(workers)
+        self.workers = MappingProxyType(workers)
+        self._lobby_rooms = MappingProxyType({lobby_room.room_id: lobby_room
+                                              for lobby_room in await self.backend.lobby_rooms()
+                                              if lobby_room.worker_id in workers})
+        self.refreshes.inc()
+
+    async def stop(self):
+        await self.backend.unregister_worker(self.worker_id)
+
+    def new_room_id(self):
+        while True:
+            room_id = secrets.token_urlsafe(6)
+            if self.ring.node_for(room_id) == self.worker_id and self.rooms.get(room_id) is None:
+                return room_id
+
+    def owner_id(self, room_id: str):
+        if self.rooms.get(room_id) is not None:
+            return self.worker_id
+        lobby_room = self._lobby_rooms.get(room_id)
+        if lobby_room is not None:
+            return lobby_room.worker_id
+        return self.ring.node_for(room_id)
+
+    def owner_url(self, room_id: str):
+        owner_id = self.owner_id(room_id)
+        if owner_id is None or owner_id == self.worker_id:
+            return None
+        owner_url = self.workers.get(owner_id)
+        return None if owner_url == self.worker_url else owner_url
+
+    def lobby(self, lang_code: str = None):
+        return [lobby_room for lobby_room in self._lobby_rooms.values()
+                if lobby_room.is_open() and (lang_code is None or lobby_room.lang_code == lang_code)]
+
+
+def create_backend(backend_name: str):
+    if backend_name == 'inprocess':
+        return InProcessBackend()
+    elif backend_name == 'mysql':
+        from settings import db
+        return MySQLBackend(db)
+    raise ValueError(f'Unknown room registry backend "{backend_name}"')
+
+
+room_registry = RoomRegistry(backend=create_backend(ROOM_REGISTRY_BACKEND), worker_id=WORKER_ID, worker_url=WORKER_URL,
+                             rooms_manager=rooms)
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import secrets
+import time
+from collections import deque
+
+from game.background import start_background_task
+from game.constants import ROOM_MAX_PLAYERS, ROOM_ROUND_DURATION, ROOM_IDLE_TIMEOUT, ROOM_PLAYER_MAX_QUEUED_MESSAGES, \
+    MIN_WORD_LENGTH
+from game.dictionary import normalize_word, dictionaries
+from game.dictionary_exceptions import DictionaryDoesNotExist
+from game.exceptions import SourceWordsNotAvailable
+from game.metrics import Counter, Gauge
+from game.solver import solvers, word_score
+from game.source_words import source_words
+
+rooms_created = Counter('rooms_created_total', 'Game rooms created')
+words_accepted = Counter('room_words_accepted_total', 'Words accepted in game rooms')
+words_rejected = Counter('room_words_rejected_total', 'Words rejected in game rooms')
+slow_players_disconnected = Counter('room_slow_players_disconnected_total',
+                                    'Players disconnected because their message queue overflowed')
+
+
+def serialize(message_type: str, **data):
+    return json.dumps({'type': message_type, **data}, ensure_ascii=False)
+
+
+class Player:
+    __slots__ = ('username', 'score', 'words', 'closed', '_messages', '_ready', '_max_queued_messages')
+
+    def __init__(self, username: str, max_queued_messages: int = ROOM_PLAYER_MAX_QUEUED_MESSAGES):
+        self.username = username
+        self.score = 0
+        self.words = []
+        self.closed = False
+        self._messages = deque()
+        self._ready = asyncio.Event()
+        self._max_queued_messages = max_queued_messages
+
+    def send(self, message: str):
+        if self.closed:
+            return
+        if len(self._messages) >= self._max_queued_messages:
+            slow_players_disconnected.inc()
+            self.close()
+            return
+        self._messages.append(message)
+        self._ready.set()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def receive(self):
+        while not self._messages:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return self._messages.popleft()
+
+
+class Room:
+    __slots__ = ('id', 'creator', 'lang_code', 'difficulty', 'source_word', 'max_players', 'duration', 'state',
+                 'players', 'submitted_words', 'answers', 'max_score', 'created_at', 'deadline', 'on_finish',
+                 '_inbox', '_timer', '_task')
+
+    def __init__(self, room_id: str, creator: str, lang_code: str, source_word: str, answers, difficulty: str = None,
+                 max_players: int = ROOM_MAX_PLAYERS, duration: float = ROOM_ROUND_DURATION, on_finish=None):
+        self.id = room_id
+        self.creator = creator
+        self.lang_code = lang_code
+        self.difficulty = difficulty
+        self.source_word = source_word
+        self.answers = frozenset(answers)
+        self.max_score = sum(map(word_score, self.answers))
+        self.max_players = max_players
+        self.duration = duration
+        self.state = 'waiting'
+        self.players = {}
+        self.submitted_words = set()
+        self.created_at = time.time()
+        self.deadline = None
+        self.on_finish = on_finish
+        self._inbox = asyncio.Queue()
+        self._timer = None
+        self._task = None
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(ROOM_IDLE_TIMEOUT, self.post, ('expire', None, None))
+        self._task = start_background_task(self.run())
+        return self._task
+
+    def post(self, event):
+        self._inbox.put_nowait(event)
+
+    def join(self, player: Player):
+        self.post(('join', player, None))
+
+    def leave(self, player: Player):
+        self.post(('leave', player, None))
+
+    def submit(self, player: Player, word: str):
+        self.post(('word', player, word))
+
+    def request_start(self, player: Player):
+        self.post(('start', player, None))
+
+    def is_open(self):
+        return self.state == 'waiting' and len(self.players) < self.max_players
+
+    def broadcast(self, message: str):
+        for player in self.players.values():
+            player.send(message)
+
+    def scores(self):
+        return {username: player.score for username, player in self.players.items()}
+
+    def snapshot(self):
+        return serialize('state', room=self.id, state=self.state, creator=self.creator, lang=self.lang_code,
+                         difficulty=self.difficulty, players=self.scores(), max_players=self.max_players,
+                         source_word=None if self.state == 'waiting' else self.source_word,
+                         words=sorted(self.submitted_words), answers_count=len(self.answers),
+                         time_left=None if self.deadline is None else max(self.deadline - time.time(), 0))
+
+    async def run(self):
+        handlers = {
+            'join': self.__on_join,
+            'leave': self.__on_leave,
+            'start': self.__on_start,
+            'word': self.__on_word,
+            'finish': self.__on_finish,
+            'expire': self.__on_finish,
+        }
+        try:
+            while self.state != 'finished':
+                event_type, player, data = await self._inbox.get()
+                handlers[event_type](player, data)
+        finally:
+            self.state = 'finished'
+            if self._timer is not None:
+                self._timer.cancel()
+            for player in self.players.values():
+                player.close()
+            if self.on_finish is not None:
+                self.on_finish(self)
+
+    def __on_join(self, player: Player, _):
+        if self.state == 'finished' or (player.username not in self.players and
+                                        len(self.players) >= self.max_players):
+            player.send(serialize('error', reason='room_is_full' if self.state != 'finished' else 'room_is_finished'))
+            player.close()
+            return
+        previous_player = self.players.get(player.username)
+        if previous_player is not None:
+            player.score, player.words = previous_player.score, previous_player.words
+            previous_player.close()
+        self.players[player.username] = player
+        player.send(self.snapshot())
+        self.broadcast(serialize('joined', username=player.username))
+
+    def __on_leave(self, player: Player, _):
+        if self.players.get(player.username) is player:
+            if self.state == 'waiting':
+                del self.players[player.username]
+            player.close()
+            self.broadcast(serialize('left', username=player.username))
+
+    def __on_start(self, player: Player, _):
+        if self.state != 'waiting' or player.username != self.creator:
+            return
+        self.state = 'playing'
+        self.deadline = time.time() + self.duration
+        self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(self.duration, self.post, ('finish', None, None))
+        self.broadcast(serialize('started', source_word=self.source_word, duration=self.duration,
+                                 answers_count=len(self.answers), max_score=self.max_score))
+
+    def __on_word(self, player: Player, word: str):
+        if self.players.get(player.username) is not player:
+            return
+        word = normalize_word(word)
+        if self.state != 'playing':
+            reason = 'round_is_not_running'
+        elif len(word) < MIN_WORD_LENGTH:
+            reason = 'too_short'
+        elif word in self.submitted_words:
+            reason = 'already_submitted'
+        elif word not in self.answers:
+            reason = 'not_a_word'
+        else:
+            self.submitted_words.add(word)
+            score = word_score(word)
+            player.score += score
+            player.words.append(word)
+            words_accepted.inc()
+            self.broadcast(serialize('accepted', username=player.username, word=word, score=score,
+                                     total_score=player.score))
+            return
+        words_rejected.inc()
+        player.send(serialize('rejected', word=word, reason=reason))
+
+    def __on_finish(self, *_):
+        self.state = 'finished'
+        self.broadcast(serialize('finished', scores=self.scores(), max_score=self.max_score,
+                                 missed_words=sorted(self.answers - self.submitted_words)))
+
+
+class RoomsManager:
+    def __init__(self):
+        self.rooms = {}
+        Gauge('rooms_active', 'Game rooms owned by this worker', function=self.__len__)
+        Gauge('room_players', 'Players connected to the rooms of this worker', function=self.players_count)
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def players_count(self):
+        return sum(len(room.players) for room in self.rooms.values())
+
+    def get(self, room_id: str):
+        return self.rooms.get(room_id)
+
+    def answers(self, lang_code: str, source_word: str):
+        dictionary = dictionaries.get(lang_code)
+        word_index = dictionary.index(source_word)
+        try:
+            answers_indexes = None if word_index is None else solvers.answers(lang_code).answers(word_index)
+        except DictionaryDoesNotExist:
+            answers_indexes = None
+        if answers_indexes is None:
+            return [word for word in solvers.get(lang_code).words(source_word) if word != source_word]
+        return [dictionary.word(answer_index) for answer_index in answers_indexes]
+
+    def create_room(self, creator: str, lang_code: str, difficulty: str, source_word: str = None, room_id: str = None,
+                    **room_settings):
+        if source_word is None:
+            sampled_word = source_words.sample(lang_code, difficulty)
+            if sampled_word is None:
+                raise SourceWordsNotAvailable()
+            source_word = sampled_word.word
+        answers = self.answers(lang_code, source_word)
+        while room_id is None or room_id in self.rooms:
+            room_id = secrets.token_urlsafe(6)
+        room = Room(room_id, creator=creator, lang_code=lang_code, source_word=source_word, answers=answers,
+                    difficulty=difficulty, on_finish=self.remove_room, **room_settings)
+        self.rooms[room_id] = room
+        room.start()
+        rooms_created.inc()
+        return room
+
+    def remove_room(self, room: Room):
+        if self.rooms.get(room.id) is room:
+            del self.rooms[room.id]
+
+    def open_rooms(self, lang_code: str = None):
+        return [room for room in self.rooms.values()
+                if room.is_open() and (lang_code is None or room.lang_code == lang_code)]
+
+
+rooms = RoomsManager()
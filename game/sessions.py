@@ -0,0 +1,93 @@
+import base64
+import binascii
+import datetime
+import secrets
+import time
+
+from game.cache import LRUCache
+from game.constants import SESSIONS_CACHE_MAX_SIZE, SESSIONS_CACHE_TTL, SESSION_LIFETIME, \
+    REMEMBERED_SESSION_LIFETIME, SESSIONS_SYNC_CHUNK_SIZE
+from game.signing import sign, verify
+from settings import db
+
+
+class Session:
+    __slots__ = ('username', 'session_key', 'expires', 'cached_at')
+
+    def __init__(self, username: str, session_key: str, expires: int):
+        self.username = username
+        self.session_key = session_key
+        self.expires = expires
+        self.cached_at = time.monotonic()
+
+    def is_expired(self):
+        return self.expires <= time.time()
+
+
+class SessionsManager:
+    def __init__(self, database, cache_max_size: int, cache_ttl: float):
+        self.db = database
+        self.cache_ttl = cache_ttl
+        self._cache = LRUCache(name='sessions', max_size=cache_max_size)
+
+    @staticmethod
+    def make_token(username: str, session_key: str, expires: int):
+        encoded_username = base64.urlsafe_b64encode(username.encode('utf-8')).decode('ascii')
+        payload = f'{encoded_username}.{session_key}.{expires}'
+        return f'{payload}.{sign(payload.encode("utf-8"))}'
+
+    @staticmethod
+    def parse_token(token: str):
+        try:
+            encoded_username, session_key, expires, signature = token.split('.')
+            if not verify(f'{encoded_username}.{session_key}.{expires}'.encode('utf-8'), signature):
+                return None
+            session = Session(username=base64.urlsafe_b64decode(encoded_username.encode('ascii')).decode('utf-8'),
+                              session_key=session_key, expires=int(expires))
+        except (ValueError, TypeError, binascii.Error, UnicodeError):
+            return None
+        return None if session.is_expired() else session
+
+    async def create(self, username: str, remember: bool = False):
+        lifetime = REMEMBERED_SESSION_LIFETIME if remember else SESSION_LIFETIME
+        session_key = secrets.token_hex(32)
+        expires = int(time.time()) + lifetime
+        await self.db.create(table='session', columns=['session_key'], values=[session_key])
+        self._cache.set(session_key, Session(username=username, session_key=session_key, expires=expires))
+        return self.make_token(username, session_key, expires), datetime.datetime.fromtimestamp(expires)
+
+    async def validate(self, token: str):
+        session = self.parse_token(token)
+        if session is None:
+            return None
+        cached_session = self._cache.get(session.session_key)
+        if cached_session is not None and time.monotonic() - cached_session.cached_at < self.cache_ttl:
+            return cached_session.username if cached_session.username == session.username else None
+
+        session_exists = await self.db.filter(table='session', columns=['session_key'],
+                                              condition={'session_key': session.session_key})
+        if not session_exists:
+            self._cache.pop(session.session_key)
+            return None
+        self._cache.set(session.session_key, session)
+        return session.username
+
+    async def sync_revocations(self):
+        session_keys = self._cache.keys()
+        for chunk_start in range(0, len(session_keys), SESSIONS_SYNC_CHUNK_SIZE):
+            chunk = session_keys[chunk_start:chunk_start + SESSIONS_SYNC_CHUNK_SIZE]
+            existing_session_keys = set(await self.db.filter(table='session', columns=['session_key'],
+                                                             condition={'session_key': chunk}))
+            for session_key in chunk:
+                if session_key not in existing_session_keys:
+                    self._cache.pop(session_key)
+
+    async def revoke(self, token: str):
+        session = self.parse_token(token)
+        if session is None:
+            return
+        self._cache.pop(session.session_key)
+        await self.db.delete(table='session', condition={'session_key': session.session_key})
+
+
+sessions = SessionsManager(database=db, cache_max_size=SESSIONS_CACHE_MAX_SIZE, cache_ttl=SESSIONS_CACHE_TTL)
@@ -0,0 +1,31 @@
+import hashlib
+import hmac
+import secrets
+import string
+
+from game.constants import CSRF_TOKEN_NONCE_SIZE
+from settings import SECRET_KEY
+
+_secret_key = SECRET_KEY.encode('utf-8')
+_csrf_key = hmac.new(_secret_key, b'words_game:csrf', hashlib.sha256).digest()
+
+
+def sign(value: bytes, key: bytes = _secret_key) -> str:
+    return hmac.new(key, value, hashlib.sha256).hexdigest()
+
+
+def verify(value: bytes, signature: str, key: bytes = _secret_key) -> bool:
+    return hmac.compare_digest(sign(value, key).encode('ascii'), signature.encode('utf-8', 'surrogateescape'))
+
+
+def make_csrf_token(cookie_token: str) -> str:
+    nonce = secrets.token_hex(CSRF_TOKEN_NONCE_SIZE)
+    return f'{nonce}.{sign((nonce + cookie_token).encode("utf-8"), _csrf_key)}'
+
+
+def verify_csrf_token(cookie_token: str, form_token: str) -> bool:
+    nonce, _, signature = form_token.partition('.')
+    if len(nonce) != 2 * CSRF_TOKEN_NONCE_SIZE or not set(nonce) <= set(string.hexdigits) or \
+            not cookie_token.isascii():
+        return False
+    return verify((nonce + cookie_token).encode('ascii'), signature, _csrf_key)
@@ -0,0 +1,240 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from game.constants import MIN_WORD_LENGTH, SOURCE_WORD_MIN_LENGTH, SOURCE_WORD_MAX_LENGTH, SOLVER_EDGES_CACHE_DEPTH
+from game.dictionary import Dictionary, dictionaries
+from game.dictionary_exceptions import DictionaryDoesNotExist, InvalidDictionaryFile
+
+ANSWERS_MAGIC = b'WGANSW01'
+ANSWERS_HEADER = struct.Struct('<8sII')
+ANSWERS_FILE_EXTENSION = 'answers'
+
+
+def word_score(word: str):
+    return len(word)
+
+
+class Solver:
+    def __init__(self, dictionary: Dictionary, edges_cache_depth: int = SOLVER_EDGES_CACHE_DEPTH):
+        self.dictionary = dictionary
+        self.edges_cache_depth = edges_cache_depth
+        self.alphabet = dictionary.alphabet()
+        self.letters_indexes = {ord(letter): letter_index for letter_index, letter in enumerate(self.alphabet)}
+        self._edges_cache = {}
+
+    def signature(self, letters: str):
+        counts = [0] * len(self.alphabet)
+        mask = 0
+        for letter in letters:
+            letter_index = self.letters_indexes.get(ord(letter))
+            if letter_index is None:
+                return None, None
+            counts[letter_index] += 1
+            mask |= 1 << letter_index
+        return counts, mask
+
+    def can_form(self, word: str, letters: str):
+        word_counts, word_mask = self.signature(word)
+        letters_counts, letters_mask = self.signature(letters)
+        if word_counts is None or letters_counts is None or word_mask & ~letters_mask:
+            return False
+        return all(word_count <= letters_count for word_count, letters_count in zip(word_counts, letters_counts))
+
+    def __edges(self, node: int, depth: int):
+        edges = self._edges_cache.get(node)
+        if edges is None:
+            dictionary = self.dictionary
+            edges = tuple((self.letters_indexes[label], chr(label), target, dictionary.is_final(target),
+                           dictionary.words_below(target))
+                          for label, target in dictionary.edges(node))
+            if depth < self.edges_cache_depth:
+                self._edges_cache[node] = edges
+        return edges
+
+    def search(self, letters: str, min_length: int = MIN_WORD_LENGTH):
+        counts = [0] * len(self.alphabet)
+        for letter in letters:
+            letter_index = self.letters_indexes.get(ord(letter))
+            if letter_index is not None:
+                counts[letter_index] += 1
+        found = []
+        edges_of = self.__edges
+
+        def visit(node: int, prefix: str, node_word_index: int):
+            word_index = node_word_index
+            for letter_index, letter, target, is_final, words_below in edges_of(node, len(prefix)):
+                if counts[letter_index]:
+                    counts[letter_index] -= 1
+                    word = prefix + letter
+                    if is_final and len(word) >= min_length:
+                        found.append((word, word_index))
+                    if words_below > is_final:
+                        visit(target, word, word_index + is_final)
+                    counts[letter_index] += 1
+                word_index += words_below
+
+        visit(0, '', int(self.dictionary.is_final(0)))
+        return found
+
+    def words(self, letters: str, min_length: int = MIN_WORD_LENGTH):
+        return [word for word, _ in self.search(letters, min_length=min_length)]
+
+    def word_indexes(self, letters: str, min_length: int = MIN_WORD_LENGTH, exclude_source: bool = True):
+        return array('I', (word_index for word, word_index in self.search(letters, min_length=min_length)
+                           if not (exclude_source and word == letters)))
+
+    def max_score(self, letters: str, min_length: int = MIN_WORD_LENGTH):
+        return sum(word_score(word) for word, _ in self.search(letters, min_length=min_length) if word != letters)
+
+    def hints(self, letters: str, found_words, limit: int = 1, min_length: int = MIN_WORD_LENGTH):
+        found_words = set(found_words)
+        not_found_words = [word for word in self.words(letters, min_length=min_length)
+                           if word not in found_words and word != letters]
+        not_found_words.sort(key=len, reverse=True)
+        return not_found_words[:limit]
+
+
+class AnswersIndex:
+    def __init__(self, buffer):
+        self._buffer = buffer
+        if len(buffer) < ANSWERS_HEADER.size:
+            raise InvalidDictionaryFile('Answers file is too short')
+        magic, candidates_count, answers_count = ANSWERS_HEADER.unpack_from(buffer)
+        if magic != ANSWERS_MAGIC:
+            raise InvalidDictionaryFile('Answers file has wrong format')
+        if sys.byteorder != 'little':
+            raise InvalidDictionaryFile('Answers files can be mapped on little-endian machines only')
+        if len(buffer) != ANSWERS_HEADER.size + 4 * (2 * candidates_count + 1 + answers_count):
+            raise InvalidDictionaryFile('Answers file is truncated')
+        view = memoryview(buffer)[ANSWERS_HEADER.size:].cast('I')
+        self._candidates = view[:candidates_count]
+        self._offsets = view[candidates_count:2 * candidates_count + 1]
+        self._answers = view[2 * candidates_count + 1:]
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, 'rb') as answers_file:
+            buffer = mmap.mmap(answers_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    def __len__(self):
+        return len(self._candidates)
+
+    def __iter__(self):
+        for position, candidate_index in enumerate(self._candidates):
+            yield candidate_index, self._answers[self._offsets[position]:self._offsets[position + 1]]
+
+    def answers(self, candidate_index: int):
+        low, high = 0, len(self._candidates)
+        while low < high:
+            middle = (low + high) // 2
+            if self._candidates[middle] < candidate_index:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self._candidates) or self._candidates[low] != candidate_index:
+            return None
+        return self._answers[self._offsets[low]:self._offsets[low + 1]]
+
+
+worker_solver = None
+
+
+def init_answers_worker(dictionary_path: str):
+    global worker_solver
+    worker_solver = Solver(Dictionary.load(dictionary_path))
+
+
+def candidate_answers(candidate):
+    candidate_index, candidate_word = candidate
+    return candidate_index, worker_solver.word_indexes(candidate_word).tobytes()
+
+
+def is_source_word_candidate(word: str):
+    return SOURCE_WORD_MIN_LENGTH <= len(word) <= SOURCE_WORD_MAX_LENGTH
+
+
+def build_answers(dictionary_path: str, answers_path: str, processes: int = None, chunk_size: int = 64):
+    dictionary = Dictionary.load(dictionary_path)
+    candidates = [(word_index, word) for word_index, word in enumerate(dictionary.words())
+                  if is_source_word_candidate(word)]
+    candidates_indexes, offsets, answers = array('I'), array('I', [0]), array('I')
+    if processes == 1:
+        init_answers_worker(dictionary_path)
+        results = map(candidate_answers, candidates)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=processes, initializer=init_answers_worker,
+                                       initargs=(dictionary_path,))
+        results = executor.map(candidate_answers, candidates, chunksize=chunk_size)
+    try:
+        for candidate_index, candidate_answers_bytes in results:
+            candidates_indexes.append(candidate_index)
+            answers.frombytes(candidate_answers_bytes)
+            offsets.append(len(answers))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if sys.byteorder != 'little':
+        for values in (candidates_indexes, offsets, answers):
+            values.byteswap()
+    temporary_path = answers_path + '.tmp'
+    with open(temporary_path, 'wb') as answers_file:
+        answers_file.write(ANSWERS_HEADER.pack(ANSWERS_MAGIC, len(candidates_indexes), len(answers)))
+        for values in (candidates_indexes, offsets, answers):
+            answers_file.write(values.tobytes())
+    os.replace(temporary_path, answers_path)
+    return len(candidates_indexes)
+
+
+class SolversRegistry:
+    def __init__(self, dictionaries_registry):
+        self.dictionaries = dictionaries_registry
+        self._solvers = {}
+        self._answers = {}
+        self._lock = threading.Lock()
+
+    def get(self, lang_code: str):
+        dictionary = self.dictionaries.get(lang_code)
+        solver = self._solvers.get(lang_code)
+        if solver is None or solver.dictionary is not dictionary:
+            solver = self._solvers[lang_code] = Solver(dictionary)
+        return solver
+
+    def answers(self, lang_code: str):
+        answers_index = self._answers.get(lang_code)
+        if answers_index is None:
+            with self._lock:
+                answers_index = self._answers.get(lang_code)
+                if answers_index is None:
+                    try:
+                        answers_index = AnswersIndex.load(self.dictionaries.path(lang_code, ANSWERS_FILE_EXTENSION))
+                    except FileNotFoundError:
+                        raise DictionaryDoesNotExist(f'Answers for language "{lang_code}" are not built')
+                    self._answers[lang_code] = answers_index
+        return answers_index
+
+    def build_answers(self, lang_code: str, processes: int = None):
+        candidates_count = build_answers(self.dictionaries.path(lang_code),
+                                         self.dictionaries.path(lang_code, ANSWERS_FILE_EXTENSION),
+                                         processes=processes)
+        self.reload(lang_code)
+        return candidates_count
+
+    def reload(self, lang_code: str = None):
+        with self._lock:
+            if lang_code is None:
+                self._solvers.clear()
+                self._answers.clear()
+            else:
+                self._solvers.pop(lang_code, None)
+                self._answers.pop(lang_code, None)
+
+
+solvers = SolversRegistry(dictionaries)
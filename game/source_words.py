@@ -0,0 +1,61 @@
+import random
+from array import array
+from types import MappingProxyType
+
+from game.constants import DIFFICULTY_LEVELS, SOURCE_WORD_MIN_ANSWERS
+from game.metrics import Counter
+from game.solver import word_score
+from settings import db, lang_db
+
+SOURCE_WORDS_COLUMNS = ['lang_id', 'word', 'achievable_count', 'max_score', 'difficulty']
+
+
+def score_source_words(dictionary, answers_index, min_answers: int = SOURCE_WORD_MIN_ANSWERS):
+    words = list(dictionary.words())
+    scores = array('I', map(word_score, words))
+    scored_words = []
+    for candidate_index, answers in answers_index:
+        if len(answers) >= min_answers:
+            scored_words.append((words[candidate_index], len(answers), sum(scores[answer] for answer in answers)))
+    scored_words.sort(key=lambda scored_word: (-scored_word[1], scored_word[0]))
+    return [(word, achievable_count, max_score, position * len(DIFFICULTY_LEVELS) // len(scored_words))
+            for position, (word, achievable_count, max_score) in enumerate(scored_words)]
+
+
+async def store_source_words(lang_id: int, scored_words):
+    async with db.transaction() as conn:
+        await db.delete(table='source_words', condition={'lang_id': lang_id}, connection=conn)
+        return await db.bulk_create(table='source_words', columns=SOURCE_WORDS_COLUMNS,
+                                    rows=((lang_id, *scored_word) for scored_word in scored_words),
+                                    connection=conn)
+
+
+class SourceWordsSampler:
+    def __init__(self, common_db, languages_db):
+        self.db = common_db
+        self.lang_db = languages_db
+        self._buckets = MappingProxyType({})
+        self.misses = Counter('source_words_sampler_misses_total', 'Source words requested for an empty bucket')
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    async def refresh(self):
+        lang_ids_by_code = await self.lang_db.get_lang_ids_by_code()
+        lang_codes_by_id = {lang_id: lang_code for lang_code, lang_id in lang_ids_by_code.items()}
+        buckets = {}
+        for source_word in await self.db.filter(table='source_words', columns=SOURCE_WORDS_COLUMNS, as_records=True):
+            lang_code = lang_codes_by_id.get(source_word.lang_id)
+            if lang_code is not None and source_word.difficulty < len(DIFFICULTY_LEVELS):
+                buckets.setdefault((lang_code, DIFFICULTY_LEVELS[source_word.difficulty]), []).append(source_word)
+        self._buckets = MappingProxyType({bucket: tuple(bucket_words) for bucket, bucket_words in buckets.items()})
+
+    def sample(self, lang_code: str, difficulty: str):
+        bucket = self._buckets.get((lang_code, difficulty))
+        if not bucket:
+            self.misses.inc()
+            return None
+        return random.choice(bucket)
+
+
+source_words = SourceWordsSampler(common_db=db, languages_db=lang_db)
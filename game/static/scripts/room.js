@@ -0,0 +1,94 @@
+let room = document.getElementById('room')
+let protocol = location.protocol === 'https:' ? 'wss:' : 'ws:'
+let socket = new WebSocket(`${protocol}//${location.host}${room.dataset.wsUrl}`)
+let players = {}
+let timerDeadline = null
+
+function renderPlayers() {
+    let playersList = document.getElementById('players')
+    playersList.replaceChildren(...Object.entries(players).map(function ([username, score]) {
+        let item = document.createElement('li')
+        item.textContent = `${username}: ${score}`
+        return item
+    }))
+}
+
+function addWord(username, word) {
+    let item = document.createElement('li')
+    item.textContent = `${word} (${username})`
+    document.getElementById('words').prepend(item)
+}
+
+function setStatus(text) {
+    document.getElementById('status').textContent = text
+}
+
+function startTimer(seconds) {
+    timerDeadline = Date.now() + seconds * 1000
+}
+
+setInterval(function () {
+    if (timerDeadline !== null) {
+        let secondsLeft = Math.max(Math.round((timerDeadline - Date.now()) / 1000), 0)
+        document.getElementById('timer').textContent = secondsLeft
+    }
+}, 500)
+
+socket.addEventListener('close', function (event) {
+    if (event.code === Number(room.dataset.movedCloseCode) && event.reason) {
+        location.assign(event.reason + location.pathname)
+    }
+})
+
+socket.addEventListener('message', function (event) {
+    let message = JSON.parse(event.data)
+    switch (message.type) {
+        case 'state':
+            players = message.players
+            document.getElementById('source_word').textContent = message.source_word || ''
+            document.getElementById('start_button').hidden = message.state !== 'waiting'
+            message.words.forEach(function (word) { addWord('', word) })
+            if (message.time_left !== null) {
+                startTimer(message.time_left)
+            }
+            break
+        case 'joined':
+            players[message.username] = players[message.username] || 0
+            break
+        case 'left':
+            setStatus(`${message.username} left`)
+            break
+        case 'started':
+            document.getElementById('source_word').textContent = message.source_word
+            document.getElementById('start_button').hidden = true
+            startTimer(message.duration)
+            break
+        case 'accepted':
+            players[message.username] = message.total_score
+            addWord(message.username, message.word)
+            break
+        case 'rejected':
+            setStatus(`${message.word}: ${message.reason}`)
+            break
+        case 'finished':
+            players = message.scores
+            timerDeadline = null
+            setStatus(`Game over. Missed words: ${message.missed_words.join(', ')}`)
+            break
+        case 'error':
+            setStatus(message.reason)
+            break
+    }
+    renderPlayers()
+})
+
+document.getElementById('start_button').addEventListener('click', function () {
+    socket.send(JSON.stringify({type: 'start'}))
+})
+
+document.getElementById('word_form').addEventListener('submit', function (event) {
+    event.preventDefault()
+    let wordInput = document.getElementById('word_input')
+    socket.send(JSON.stringify({type: 'word', word: wordInput.value}))
+    wordInput.value = ''
+})
@@ -0,0 +1,84 @@
+import hashlib
+import mimetypes
+import os
+from urllib.parse import parse_qs
+
+IMMUTABLE_CACHE_CONTROL = b'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = b'no-cache'
+
+
+class StaticFile:
+    __slots__ = ('content', 'content_type', 'content_hash', 'etag')
+
+    def __init__(self, content: bytes, content_type: str):
+        self.content = content
+        self.content_type = content_type.encode('latin-1')
+        self.content_hash = hashlib.sha256(content).hexdigest()[:16]
+        self.etag = f'"{self.content_hash}"'.encode('latin-1')
+
+
+class StaticFilesIndex:
+    def __init__(self, folder: str, url_path: str = '/static'):
+        self.folder = folder
+        self.url_path = url_path.rstrip('/') + '/'
+        self.files = {}
+        self.build()
+
+    def build(self):
+        files = {}
+        for dir_path, _, filenames in os.walk(self.folder):
+            for filename in filenames:
+                file_path = os.path.join(dir_path, filename)
+                relative_path = os.path.relpath(file_path, self.folder).replace(os.sep, '/')
+                content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                if content_type.startswith('text/') or content_type == 'application/javascript':
+                    content_type += '; charset=utf-8'
+                with open(file_path, 'rb') as static_file:
+                    files[relative_path] = StaticFile(static_file.read(), content_type)
+        self.files = files
+
+    def get(self, path: str):
+        return self.files.get(path.lstrip('/'))
+
+    def file_hash(self, path: str):
+        static_file = self.get(path)
+        return None if static_file is None else static_file.content_hash
+
+
+class StaticFilesMiddleware:
+    def __init__(self, app, static_files_index: StaticFilesIndex):
+        self.app = app
+        self.index = static_files_index
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD') and \
+                scope['path'].startswith(self.index.url_path):
+            static_file = self.index.get(scope['path'][len(self.index.url_path):])
+            if static_file is not None:
+                await self.send_file(scope, send, static_file)
+                return
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def send_file(scope, send, static_file: StaticFile):
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        if query.get('v', [None])[0] == static_file.content_hash:
+            cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            cache_control = REVALIDATE_CACHE_CONTROL
+        headers = [(b'etag', static_file.etag), (b'cache-control', cache_control)]
+
+        if_none_match = dict(scope['headers']).get(b'if-none-match')
+        if if_none_match is not None and static_file.etag in [etag.strip() for etag in if_none_match.split(b',')]:
+            await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        headers += [(b'content-type', static_file.content_type),
+                    (b'content-length', str(len(static_file.content)).encode('latin-1'))]
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        body = b'' if scope['method'] == 'HEAD' else static_file.content
+        await send({'type': 'http.response.body', 'body': body})
+
+
+static_files_index = StaticFilesIndex(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
@@ -0,0 +1,48 @@
+import logging
+import os
+import time
+
+from jinja2 import FileSystemBytecodeCache
+from quart import current_app
+
+from game.metrics import Gauge
+from settings import TEMPLATES_PRODUCTION_MODE, TEMPLATES_BYTECODE_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+templates_warm_up_seconds = Gauge('templates_warm_up_seconds', 'Time spent compiling templates on startup')
+templates_warmed_up = Gauge('templates_warmed_up', 'Templates compiled on startup')
+
+
+def create_bytecode_cache(directory: str = None):
+    if directory is None:
+        return FileSystemBytecodeCache()
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    directory_stat = os.stat(directory)
+    if hasattr(os, 'getuid') and directory_stat.st_uid != os.getuid():
+        raise RuntimeError(f'Templates bytecode cache directory "{directory}" belongs to another user')
+    if directory_stat.st_mode & 0o022:
+        raise RuntimeError(f'Templates bytecode cache directory "{directory}" is writable by other users')
+    return FileSystemBytecodeCache(directory)
+
+
+def configure_templates(app):
+    if TEMPLATES_PRODUCTION_MODE:
+        app.config['TEMPLATES_AUTO_RELOAD'] = False
+        app.jinja_options = {
+            **app.jinja_options,
+            'auto_reload': False,
+            'bytecode_cache': create_bytecode_cache(TEMPLATES_BYTECODE_CACHE_DIR),
+        }
+
+
+async def warm_up_templates():
+    jinja_env = current_app.jinja_env
+    started_at = time.perf_counter()
+    templates_names = [name for name in jinja_env.list_templates() if name.endswith('.html')]
+    for template_name in templates_names:
+        jinja_env.get_template(template_name)
+    elapsed = time.perf_counter() - started_at
+    templates_warm_up_seconds.set(elapsed)
+    templates_warmed_up.set(len(templates_names))
+    logger.info(f'Loaded {len(templates_names)} templates in {elapsed * 1000:.1f} ms')
@@ -0,0 +1,51 @@
+import sys
+from types import MappingProxyType
+
+
+class TranslationsTable:
+    __slots__ = ('_texts', '_content_ids', '_keys', '_frozen')
+
+    def __init__(self):
+        self._texts = {}
+        self._content_ids = {}
+        self._keys = {}
+        self._frozen = False
+
+    def __len__(self):
+        return sum(len(lang_texts) for lang_texts in self._texts.values())
+
+    def add_row(self, lang_code: str, table_type: str, codename: str, text_content_id: int, text: str):
+        if self._frozen:
+            raise TypeError('Translations table is frozen')
+        key = (sys.intern(table_type), sys.intern(codename))
+        key = self._keys.setdefault(key, key)
+        lang_texts = self._texts.get(lang_code)
+        if lang_texts is None:
+            lang_texts = self._texts[sys.intern(lang_code)] = {}
+        lang_texts[key] = text
+        self._content_ids[key] = text_content_id
+
+    def freeze(self):
+        self._texts = MappingProxyType({lang_code: MappingProxyType(lang_texts)
+                                        for lang_code, lang_texts in self._texts.items()})
+        self._content_ids = MappingProxyType(self._content_ids)
+        self._keys = None
+        self._frozen = True
+        return self
+
+    def lookup(self, lang_code: str, table_type: str, codenames, include_content_ids: bool = False):
+        lang_texts = self._texts.get(lang_code)
+        if lang_texts is None:
+            return None
+        content = {}
+        for codename in codenames:
+            try:
+                content[codename] = lang_texts[(table_type, codename)]
+            except KeyError:
+                return None
+        if include_content_ids:
+            return {
+                'content': content,
+                'content_ids': sorted(self._content_ids[(table_type, codename)] for codename in content),
+            }
+        return content
@@ -1,9 +1,11 @@
 from quart import Blueprint
 
+from game.constants import METRICS_PATH
 from game.error_handlers import not_found, obj_not_found
 from game.exceptions import ObjectNotFound
 from game.preprocessors import before_request, context_processor, after_request
-from game.views import index, login, login_post, user
+from game.views import index, login, login_post, logout, user, metrics, new_game, new_game_post, join_game, room, \
+    room_websocket
 
 game_blueprint = Blueprint('game', __name__, template_folder='templates', static_folder='static')
 game_blueprint.before_request(before_request)
@@ -16,4 +18,11 @@ game_blueprint.register_error_handler(ObjectNotFound, obj_not_found)
 game_blueprint.add_url_rule('/', view_func=index)
 game_blueprint.add_url_rule('/login', view_func=login)
 game_blueprint.add_url_rule('/login', view_func=login_post, methods=['POST'])
+game_blueprint.add_url_rule('/logout', view_func=logout, methods=['POST'])
 game_blueprint.add_url_rule('/user', view_func=user)
+game_blueprint.add_url_rule(METRICS_PATH, view_func=metrics)
+game_blueprint.add_url_rule('/new_game', view_func=new_game)
+game_blueprint.add_url_rule('/new_game', view_func=new_game_post, methods=['POST'])
+game_blueprint.add_url_rule('/join_game', view_func=join_game)
+game_blueprint.add_url_rule('/room/<room_id>', view_func=room)
+game_blueprint.add_websocket('/room/<room_id>/ws', view_func=room_websocket)
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+from game.background import start_background_task
+from game.cache import LRUCache
+from game.constants import USER_PROFILES_CACHE_MAX_SIZE, PROFILE_FRAGMENTS_CACHE_MAX_SIZE
+from game.database_exceptions import ObjectDoesNotExist
+from settings import db, USER_PROFILES_CACHE_TTL, PROFILE_FRAGMENTS_CACHE, PROFILE_FRAGMENTS_CACHE_TTL
+
+USER_COLUMNS = ['user.name', 'user.creation_date', 'user.last_visit', 'user.rating', 'user.sign_color',
+                'user.description', 'privilege.codename']
+
+
+class UserProfilesCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.ttl = ttl
+        self._cache = LRUCache(name='user_profiles', max_size=max_size)
+
+    def get(self, username: str):
+        cached = self._cache.get(username.lower())
+        if cached is None:
+            return None
+        user, cached_at = cached
+        if time.monotonic() - cached_at >= self.ttl:
+            self._cache.pop(username.lower())
+            return None
+        return user
+
+    def set(self, username: str, user):
+        if self.ttl > 0:
+            self._cache.set(username.lower(), (user, time.monotonic()))
+
+    def invalidate(self, username: str):
+        self._cache.pop(username.lower())
+
+    def clear(self):
+        self._cache.clear()
+
+
+class ProfileFragmentsCache:
+    def __init__(self, max_size: int, ttl: float, enabled: bool = True):
+        self.enabled = enabled and ttl > 0
+        self.ttl = ttl
+        self._cache = LRUCache(name='profile_fragments', max_size=max_size)
+
+    def get(self, username: str, lang: str):
+        if not self.enabled:
+            return None
+        cached = self._cache.get(username.lower())
+        if cached is None:
+            return None
+        fragments, cached_at = cached
+        if time.monotonic() - cached_at >= self.ttl:
+            self._cache.pop(username.lower())
+            return None
+        return fragments.get(lang)
+
+    def set(self, username: str, lang: str, fragment: str):
+        if self.enabled:
+            cached = self._cache.get(username.lower())
+            if cached is None:
+                cached = ({}, time.monotonic())
+                self._cache.set(username.lower(), cached)
+            cached[0][lang] = fragment
+
+    def invalidate(self, username: str):
+        self._cache.pop(username.lower())
+
+    def clear(self):
+        self._cache.clear()
+
+
+class UserLoader:
+    def __init__(self, database, profiles_cache: UserProfilesCache = None):
+        self.db = database
+        self.profiles_cache = profiles_cache
+        self._users = {}
+        self._pending = {}
+
+    async def load(self, username: str):
+        if username in self._users:
+            return self._users[username]
+        if self.profiles_cache is not None:
+            user = self.profiles_cache.get(username)
+            if user is not None:
+                self._users[username] = user
+                return user
+        future = self._pending.get(username)
+        if future is None:
+            if not self._pending:
+                start_background_task(self.__load_pending())
+            future = self._pending[username] = asyncio.get_running_loop().create_future()
+        return await asyncio.shield(future)
+
+    async def get(self, username: str):
+        user = await self.load(username)
+        if user is None:
+            raise ObjectDoesNotExist('No objects found')
+        return user
+
+    async def __load_pending(self):
+        await asyncio.sleep(0)
+        pending, self._pending = self._pending, {}
+        try:
+            users = await self.db.filter(table='user',
+                                         columns=USER_COLUMNS,
+                                         condition={'user.name': list(pending)},
+                                         join_tables=['privilege'],
+                                         join_conditions=['user.privilege=privilege.id'],
+                                         as_records=True)
+        except Exception as error:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            return
+        users = {user.name.lower(): user for user in users}
+        for username, future in pending.items():
+            user = self._users[username] = users.get(username.lower())
+            if user is not None and self.profiles_cache is not None:
+                self.profiles_cache.set(username, user)
+            if not future.done():
+                future.set_result(user)
+
+
+user_profiles_cache = UserProfilesCache(max_size=USER_PROFILES_CACHE_MAX_SIZE, ttl=USER_PROFILES_CACHE_TTL)
+profile_fragments = ProfileFragmentsCache(max_size=PROFILE_FRAGMENTS_CACHE_MAX_SIZE, ttl=PROFILE_FRAGMENTS_CACHE_TTL,
+                                          enabled=PROFILE_FRAGMENTS_CACHE)
+
+
+def invalidate_user(table: str, condition):
+    usernames = None
+    if isinstance(condition, dict):
+        usernames = condition.get('name', condition.get('user.name'))
+    if usernames is None:
+        user_profiles_cache.clear()
+        profile_fragments.clear()
+        return
+    for username in [usernames] if isinstance(usernames, str) else usernames:
+        user_profiles_cache.invalidate(username)
+        profile_fragments.invalidate(username)
+
+
+def make_user_loader():
+    return UserLoader(database=db, profiles_cache=user_profiles_cache)
+
+
+db.add_update_listener('user', invalidate_user)
@@ -1,10 +1,22 @@
-import datetime
+import asyncio
+import json
 
-import bcrypt
-from quart import render_template, request, make_response, redirect, abort, g
+from markupsafe import Markup
+from quart import render_template, request, make_response, redirect, abort, g, current_app, websocket, url_for
 
+from game.constants import AUTH_TOKEN_COOKIE, DIFFICULTY_LEVELS, ROOM_MAX_MESSAGE_SIZE, ROOM_MOVED_CLOSE_CODE
+from game.context_processor import static_files_context_processor
+from game.cookies import get_cookie
 from game.database_exceptions import ObjectDoesNotExist
-from game.exceptions import ObjectNotFound
+from game.dictionary_exceptions import DictionaryDoesNotExist
+from game.exceptions import ObjectNotFound, SourceWordsNotAvailable
+from game.hashing import hashing_executor
+from game.metrics import export_metrics
+from game.middleware import metrics_access_allowed
+from game.room_registry import room_registry
+from game.rooms import rooms, Player
+from game.sessions import sessions
+from game.users import profile_fragments
 from settings import db
 
 
@@ -40,21 +52,17 @@ async def login_post():
         return await render_template(template_name, **template_args)
 
     try:
-        user_password_hash = await db.get(table='user', columns=['password'], condition=f'name="{username}"')
+        user_password_hash = await db.get(table='user', columns=['password'], condition={'name': username})
     except ObjectDoesNotExist:
         template_args['username_state'] = 'wrong'
         template_args['username_error'] = f'Пользователя "{username}" не существует'
         return await render_template(template_name, **template_args)
 
-    if bcrypt.checkpw(password.encode('utf-8'), user_password_hash.encode('utf-8')):
+    if await hashing_executor.check_password(password, user_password_hash):
         response = await make_response(redirect('/' if next_page is None else next_page))
-        if remember_password:
-            expire_date = datetime.datetime.now() + datetime.timedelta(days=30)
-        else:
-            expire_date = None
-        response.set_cookie('username', username, expires=expire_date)
-        response.set_cookie('password', bcrypt.hashpw(user_password_hash.encode('utf-8'), bcrypt.gensalt()).decode('utf-8'),
-                            expires=expire_date)
+        auth_token, token_expire_date = await sessions.create(username, remember=bool(remember_password))
+        expire_date = token_expire_date if remember_password else None
+        response.set_cookie(AUTH_TOKEN_COOKIE, auth_token, expires=expire_date, httponly=True, samesite='Lax')
         return response
     else:
         template_args['password_state'] = 'wrong'
@@ -62,30 +70,127 @@ async def login_post():
         return await render_template(template_name, **template_args)
 
 
+async def logout():
+    response = await make_response(redirect('/'))
+    auth_token = get_cookie(request=request, key=AUTH_TOKEN_COOKIE)
+    if auth_token is not None:
+        await sessions.revoke(auth_token)
+    response.delete_cookie(AUTH_TOKEN_COOKIE)
+    return response
+
+
 async def user():
     username = request.args.get('name')
-    template_args = {}
     if username is None:
         abort(404)
 
-    try:
-        creation_date, last_visit, rating, \
-        user_color, description, privilege = await db.get(table='user',
-                                                          columns=['creation_date', 'last_visit', 'rating',
-                                                                   'sign_color', 'description', 'codename'],
-                                                          condition=f'name="{username}"',
-                                                          join_tables=['privilege'],
-                                                          join_conditions=['user.privilege=privilege.id'])
-    except ObjectDoesNotExist:
+    users_to_load = [username] if g.username is None else [username, g.username]
+    profile, *_ = await asyncio.gather(*[g.user_loader.load(name) for name in users_to_load])
+    if profile is None:
         raise ObjectNotFound(obj=username, obj_name='Пользователя')
 
-    username_first_letter = username[0].upper()
-    template_args['username'] = username
-    template_args['creation_date'] = creation_date
-    template_args['last_visit'] = last_visit
-    template_args['rating'] = rating
-    template_args['user_color'] = user_color
-    template_args['description'] = description
-    template_args['privilege'] = privilege
-    template_args['first_letter'] = username_first_letter
-    return await render_template('user.html', **template_args)
\ No newline at end of file
+    profile_html = profile_fragments.get(profile.name, g.lang)
+    if profile_html is None:
+        profile_html = await render_profile(profile)
+        profile_fragments.set(profile.name, g.lang, profile_html)
+    return await render_template('user.html', profile_username=profile.name, profile_color=profile.sign_color,
+                                 profile_html=Markup(profile_html))
+
+
+async def render_profile(profile):
+    template_args = {
+        'profile_username': profile.name,
+        'profile_first_letter': profile.name[0].upper(),
+        'creation_date': profile.creation_date,
+        'last_visit': profile.last_visit,
+        'rating': profile.rating,
+        'description': profile.description,
+        'privilege': profile.codename,
+        'static': static_files_context_processor,
+    }
+    return await current_app.jinja_env.get_template('user_profile.html').render_async(**template_args)
+
+
+async def new_game():
+    return await render_template('new_game.html', difficulty_levels=DIFFICULTY_LEVELS)
+
+
+async def new_game_post():
+    form = await request.form
+    difficulty = form.get('difficulty')
+    if difficulty not in DIFFICULTY_LEVELS:
+        abort(400)
+    try:
+        game_room = rooms.create_room(creator=g.username, lang_code=g.lang, difficulty=difficulty,
+                                      room_id=room_registry.new_room_id())
+    except DictionaryDoesNotExist:
+        raise SourceWordsNotAvailable()
+    return redirect(url_for('game.room', room_id=game_room.id))
+
+
+async def join_game():
+    return await render_template('join_game.html', rooms=room_registry.lobby(lang_code=g.lang))
+
+
+async def room(room_id):
+    game_room = rooms.get(room_id)
+    if game_room is None:
+        owner_url = room_registry.owner_url(room_id)
+        if owner_url is not None:
+            return redirect(owner_url + request.full_path.rstrip('?'))
+        raise ObjectNotFound(obj=room_id, obj_name='Комнаты')
+    return await render_template('room.html', room=game_room, moved_close_code=ROOM_MOVED_CLOSE_CODE)
+
+
+async def room_websocket(room_id):
+    game_room = rooms.get(room_id)
+    auth_token = websocket.cookies.get(AUTH_TOKEN_COOKIE)
+    username = None if auth_token is None else await sessions.validate(auth_token)
+    origin = websocket.headers.get('Origin')
+    if username is None or (origin is not None and origin.split('://')[-1] != websocket.host):
+        await websocket.close(1008)
+        return
+    if game_room is None:
+        owner_url = room_registry.owner_url(room_id)
+        if owner_url is None:
+            await websocket.close(1008)
+        else:
+            await websocket.accept()
+            await websocket.close(ROOM_MOVED_CLOSE_CODE, owner_url)
+        return
+
+    player = Player(username)
+    game_room.join(player)
+
+    async def receive_messages():
+        while True:
+            data = await websocket.receive()
+            if len(data) > ROOM_MAX_MESSAGE_SIZE:
+                continue
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            if not isinstance(message, dict):
+                continue
+            if message.get('type') == 'word' and isinstance(message.get('word'), str):
+                game_room.submit(player, message['word'])
+            elif message.get('type') == 'start':
+                game_room.request_start(player)
+
+    receiver = asyncio.get_running_loop().create_task(receive_messages())
+    try:
+        while True:
+            message = await player.receive()
+            if message is None:
+                break
+            await websocket.send(message)
+    finally:
+        receiver.cancel()
+        game_room.leave(player)
+
+
+async def metrics():
+    if not metrics_access_allowed(request):
+        abort(403)
+    return export_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from game.background import start_background_task
+from game.constants import SESSION_WRITES_MAX_SIZE, SESSION_WRITES_FLUSH_SIZE, SESSION_WRITES_FLUSH_INTERVAL, \
+    SESSION_WRITES_MAX_RETRIES, WRITE_BEHIND_RETRY_BACKOFF, WRITE_BEHIND_MAX_RETRY_BACKOFF
+from game.metrics import Counter, Gauge
+from settings import db
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    drop_policies = ('oldest', 'newest')
+
+    def __init__(self, database, table: str, columns: list, max_size: int, flush_size: int, flush_interval: float,
+                 drop_policy: str = 'oldest', max_retries: int = 0, retry_backoff: float = WRITE_BEHIND_RETRY_BACKOFF,
+                 max_retry_backoff: float = WRITE_BEHIND_MAX_RETRY_BACKOFF):
+        if drop_policy not in self.drop_policies:
+            raise ValueError(f'Unknown drop policy "{drop_policy}"')
+        self.db = database
+        self.table = table
+        self.columns = columns
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._rows = deque()
+        self._failures = 0
+        self._retry_at = 0
+        self._flush_needed = None
+        self._task = None
+        self._stopping = False
+        labels = {'table': table}
+        self.queued_rows = Counter('write_behind_queued_rows_total', 'Rows queued for a deferred write', labels=labels)
+        self.flushed_rows = Counter('write_behind_flushed_rows_total', 'Rows written by a deferred flush',
+                                    labels=labels)
+        self.retried_rows = Counter('write_behind_retried_rows_total', 'Rows requeued after a failed deferred flush',
+                                    labels=labels)
+        self.failed_rows = Counter('write_behind_failed_rows_total', 'Rows lost because deferred flushes kept failing',
+                                   labels=labels)
+        self.dropped_rows = Counter('write_behind_dropped_rows_total', 'Rows dropped because the buffer was full',
+                                    labels=labels)
+        Gauge('write_behind_buffered_rows', 'Rows waiting for a deferred write', labels=labels, function=self.__len__)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def append(self, row):
+        if len(self._rows) >= self.max_size:
+            self.dropped_rows.inc()
+            if self.drop_policy == 'newest':
+                return False
+            self._rows.popleft()
+        self._rows.append(row)
+        self.queued_rows.inc()
+        if len(self._rows) >= self.flush_size and self._flush_needed is not None:
+            self._flush_needed.set()
+        return True
+
+    def __requeue(self, rows: list):
+        overflow = len(rows) + len(self._rows) - self.max_size
+        if overflow > 0:
+            self.dropped_rows.inc(overflow)
+            if self.drop_policy == 'oldest':
+                rows = rows[overflow:]
+            else:
+                for _ in range(overflow):
+                    self._rows.pop()
+        self._rows.extendleft(reversed(rows))
+        self.retried_rows.inc(len(rows))
+
+    async def flush(self, final: bool = False):
+        if not final and time.monotonic() < self._retry_at:
+            return
+        while self._rows:
+            rows = [self._rows.popleft() for _ in range(min(self.flush_size, len(self._rows)))]
+            try:
+                await self.db.bulk_create(table=self.table, columns=self.columns, rows=rows)
+            except Exception:
+                self._failures += 1
+                if final or self._failures > self.max_retries:
+                    self.failed_rows.inc(len(rows))
+                    logger.exception(f'Dropped {len(rows)} rows after {self._failures} failed flushes into '
+                                     f'"{self.table}"')
+                    self._failures = 0
+                    if final:
+                        continue
+                else:
+                    self.__requeue(rows)
+                    logger.warning(f'Failed to flush {len(rows)} rows into "{self.table}", '
+                                   f'retry {self._failures} of {self.max_retries}', exc_info=True)
+                backoff = min(self.retry_backoff * 2 ** max(self._failures - 1, 0), self.max_retry_backoff)
+                self._retry_at = time.monotonic() + backoff
+                return
+            self._failures = 0
+            self._retry_at = 0
+            self.flushed_rows.inc(len(rows))
+
+    async def run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_needed.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_needed.clear()
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._flush_needed = asyncio.Event()
+            self._task = start_background_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._stopping = True
+            self._flush_needed.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._flush_needed = None
+        await self.flush(final=True)
+
+
+session_writes = WriteBehindBuffer(database=db, table='session', columns=['session_key'],
+                                   max_size=SESSION_WRITES_MAX_SIZE, flush_size=SESSION_WRITES_FLUSH_SIZE,
+                                   flush_interval=SESSION_WRITES_FLUSH_INTERVAL, max_retries=SESSION_WRITES_MAX_RETRIES)
@@ -1,13 +1,17 @@
 import datetime
 import os.path
 import re
+import signal
+import socket
+import subprocess
+import sys
 import traceback
 from importlib import import_module
+from importlib.util import find_spec
 
 from mysql.connector import pooling, ProgrammingError
 
 import settings
-from app_settings import app
 from settings import DATABASES_INFO
 
 
@@ -57,7 +61,7 @@ class Migration:
 
     @staticmethod
     def get_blueprint_names():
-        return [blueprint.import_name.split('.')[0] for blueprint in app.blueprints.values()]
+        return list(settings.INSTALLED_BLUEPRINTS)
 
     @staticmethod
     def file_extension(filename: str):
@@ -79,7 +83,8 @@ class Migration:
         except (AttributeError, KeyError):
             default_db = settings.DATABASES_INFO['default']
             migrations_db_info = settings.DATABASES_INFO[default_db]
-        with pooling.MySQLConnection(port=3306, database=migrations_db_info['name'],
+        with pooling.MySQLConnection(host=migrations_db_info.get('host', 'localhost'),
+                                     port=migrations_db_info.get('port', 3306), database=migrations_db_info['name'],
                                      user=migrations_db_info['user'], password=migrations_db_info['password']) as conn:
             with conn.cursor() as cur:
                 try:
@@ -104,7 +109,9 @@ class Migration:
 
     def __get_applied_migrations(self):
         try:
-            with pooling.MySQLConnection(port=3306, database=self.applied_migrations_db['name'],
+            with pooling.MySQLConnection(host=self.applied_migrations_db.get('host', 'localhost'),
+                                         port=self.applied_migrations_db.get('port', 3306),
+                                         database=self.applied_migrations_db['name'],
                                          user=self.applied_migrations_db['user'], password=self.applied_migrations_db['password']) as conn:
                 with conn.cursor() as cur:
                     cur.execute(f'SELECT blueprint, db_name, `name` FROM migrations')
@@ -116,7 +123,9 @@ class Migration:
     def __write_applied_migrations_to_db(self):
         if not self.migrations_for_db:
             return
-        with pooling.MySQLConnection(port=3306, database=self.applied_migrations_db['name'],
+        with pooling.MySQLConnection(host=self.applied_migrations_db.get('host', 'localhost'),
+                                     port=self.applied_migrations_db.get('port', 3306),
+                                     database=self.applied_migrations_db['name'],
                                      user=self.applied_migrations_db['user'],
                                      password=self.applied_migrations_db['password']) as conn:
             with conn.cursor() as cur:
@@ -550,7 +559,8 @@ class Migration:
                     blueprints_names.remove(blueprint_name)
                 for migration_db_folder in migrations_db_folders:
                     self.db_conn_pools[f'{blueprint_name}/{migration_db_folder}'] = pooling.MySQLConnectionPool(
-                        port=3306,
+                        host=self.blueprints_db_settings[blueprint_name][migration_db_folder].get('host', 'localhost'),
+                        port=self.blueprints_db_settings[blueprint_name][migration_db_folder].get('port', 3306),
                         database=self.blueprints_db_settings[blueprint_name][migration_db_folder]['name'],
                         user=self.blueprints_db_settings[blueprint_name][migration_db_folder]['user'],
                         password=self.blueprints_db_settings[blueprint_name][migration_db_folder]['password'])
@@ -580,6 +590,127 @@ class Migration:
             print(err)
 
 
+def build_dictionaries(*lang_codes):
+    from game.dictionary import dictionaries, WORDS_FILE_EXTENSION
+    from game.solver import solvers
+
+    lang_codes = lang_codes or dictionaries.available_lang_codes(WORDS_FILE_EXTENSION)
+    if not lang_codes:
+        print(CMDStyle.orange + f'No word lists found in {dictionaries.folder}' + CMDStyle.reset)
+    for lang_code in lang_codes:
+        print('Building dictionary ' + CMDStyle.yellow + lang_code + CMDStyle.reset + '...', end=' ')
+        started_at = datetime.datetime.now()
+        try:
+            words_count = dictionaries.build(lang_code)
+        except FileNotFoundError:
+            print(CMDStyle.red + f'word list {dictionaries.path(lang_code, WORDS_FILE_EXTENSION)} does not exist' +
+                  CMDStyle.reset)
+            continue
+        elapsed = (datetime.datetime.now() - started_at).total_seconds()
+        print(CMDStyle.green + f'{words_count} words, {os.path.getsize(dictionaries.path(lang_code))} bytes, '
+                               f'{elapsed:.1f} s' + CMDStyle.reset)
+        print('\tPrecomputing answers of source words...', end=' ')
+        started_at = datetime.datetime.now()
+        candidates_count = solvers.build_answers(lang_code)
+        elapsed = (datetime.datetime.now() - started_at).total_seconds()
+        print(CMDStyle.green + f'{candidates_count} source words, {elapsed:.1f} s' + CMDStyle.reset)
+
+
+def build_source_words(*lang_codes):
+    import asyncio
+    from game.dictionary import dictionaries
+    from game.solver import solvers
+    from game.source_words import score_source_words, store_source_words
+    from settings import db, lang_db
+
+    async def build():
+        await db.create_connection_pool()
+        await lang_db.create_connection_pool()
+        try:
+            lang_ids_by_code = await lang_db.get_lang_ids_by_code()
+            for lang_code in lang_codes or dictionaries.available_lang_codes():
+                if lang_code not in lang_ids_by_code:
+                    print(CMDStyle.red + f'Language "{lang_code}" does not exist in languages table' + CMDStyle.reset)
+                    continue
+                print('Scoring source words of ' + CMDStyle.yellow + lang_code + CMDStyle.reset + '...', end=' ')
+                scored_words = score_source_words(dictionaries.get(lang_code), solvers.answers(lang_code))
+                stored_count = await store_source_words(lang_ids_by_code[lang_code], scored_words)
+                print(CMDStyle.green + f'{stored_count} source words stored' + CMDStyle.reset)
+        finally:
+            await db.close_all_connections()
+            await lang_db.close_all_connections()
+
+    asyncio.run(build())
+
+
+def worker_binds(bind: str, workers: int):
+    host, _, port = bind.rpartition(':')
+    return [f'{host}:{int(port) + worker_number}' for worker_number in range(1, workers + 1)]
+
+
+def serve_workers(bind: str, workers: int):
+    host, _, port = bind.rpartition(':')
+    host = host.strip('[]')
+    server_socket = socket.create_server((host, int(port)), family=socket.AF_INET6 if ':' in host else socket.AF_INET)
+    server_socket.set_inheritable(True)
+    workers_env = {
+        **os.environ,
+        'WORDS_GAME_SECRET_KEY': settings.SECRET_KEY,
+        'WORDS_GAME_WORKERS': '1',
+        'WORDS_GAME_SERVER_FD': str(server_socket.fileno()),
+    }
+    if settings.ROOM_REGISTRY_BACKEND == 'inprocess':
+        print(CMDStyle.orange + 'Game rooms are shared between workers through the common database: '
+                                'WORDS_GAME_ROOM_REGISTRY_BACKEND=mysql is used' + CMDStyle.reset)
+        workers_env['WORDS_GAME_ROOM_REGISTRY_BACKEND'] = 'mysql'
+
+    project_folder = os.path.dirname(os.path.abspath(__file__))
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    processes = []
+    try:
+        for worker_bind in worker_binds(bind, workers):
+            processes.append(subprocess.Popen([sys.executable, os.path.join(project_folder, 'main.py'), 'serve'],
+                                              cwd=project_folder, env={**workers_env, 'WORDS_GAME_WORKER_BIND': worker_bind},
+                                              pass_fds=(server_socket.fileno(),)))
+        print('Serving on ' + CMDStyle.yellow + bind + CMDStyle.reset + f' with {workers} workers, reachable '
+              f'directly on ' + CMDStyle.yellow + ', '.join(worker_binds(bind, workers)) + CMDStyle.reset + '...')
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=settings.SERVER_GRACEFUL_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        server_socket.close()
+
+
+def serve(bind: str = None, workers: str = None):
+    bind = bind or settings.SERVER_BIND
+    workers = int(workers or settings.SERVER_WORKERS)
+    if workers > 1:
+        return serve_workers(bind, workers)
+
+    from hypercorn.config import Config
+    from hypercorn.run import run
+
+    config = Config()
+    config.application_path = 'app_settings:app'
+    config.bind = [bind] if settings.SERVER_FD is None else [f'fd://{settings.SERVER_FD}', settings.WORKER_BIND]
+    config.workers = 1
+    config.keep_alive_timeout = settings.SERVER_KEEP_ALIVE_TIMEOUT
+    config.graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+    config.worker_class = 'asyncio' if find_spec('uvloop') is None else 'uvloop'
+    if settings.SERVER_FD is None:
+        print('Serving on ' + CMDStyle.yellow + bind + CMDStyle.reset + f' with a {config.worker_class} worker...')
+    run(config)
+
+
 def execute_from_command_line(argv):
     try:
         command = argv[1]
@@ -591,12 +722,13 @@ def execute_from_command_line(argv):
     except IndexError:
         command_args = []
 
-    migration = Migration()
-
     commands_map = {
-        'prepare_migration_folders': migration.prepare_migration_folders,
-        'make_migrations': migration.make_migrations,
-        'migrate': migration.migrate
+        'prepare_migration_folders': lambda *args: Migration().prepare_migration_folders(*args),
+        'make_migrations': lambda *args: Migration().make_migrations(*args),
+        'migrate': lambda *args: Migration().migrate(*args),
+        'build_dictionaries': build_dictionaries,
+        'build_source_words': build_source_words,
+        'serve': serve,
     }
 
     try:
@@ -1,29 +1,117 @@
 import os
+import secrets
+import socket
 
-from game.database import CommonDatabase, LanguagesDatabase
+
+def database_pool_settings(env_prefix: str):
+    def optional_float(name: str, default=None):
+        value = os.getenv(f'{env_prefix}_{name}')
+        return default if value in (None, '') else float(value)
+
+    return {
+        'min_size': int(os.getenv(f'{env_prefix}_POOL_MIN_SIZE', 1)),
+        'max_size': int(os.getenv(f'{env_prefix}_POOL_MAX_SIZE', 10)),
+        'recycle': int(os.getenv(f'{env_prefix}_POOL_RECYCLE', 3600)),
+        'connect_timeout': optional_float('CONNECT_TIMEOUT', 10),
+        'acquire_timeout': optional_float('ACQUIRE_TIMEOUT', 5),
+        'health_check_interval': optional_float('HEALTH_CHECK_INTERVAL', 30),
+    }
 
 
 DATABASES_INFO = {
     'common': {
         'name': os.getenv('WORDS_GAME_DB_NAME', ''),
         'user': os.getenv('DB_USER'),
-        'password': os.getenv('DB_PASSWORD', '')
+        'password': os.getenv('DB_PASSWORD', ''),
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', 3306)),
+        'pool': database_pool_settings('WORDS_GAME_DB'),
     },
     'langs': {
         'name': os.getenv('WORDS_GAME_LANGS_DB_NAME', ''),
         'user': os.getenv('DB_USER'),
-        'password': os.getenv('DB_PASSWORD', '')
+        'password': os.getenv('DB_PASSWORD', ''),
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', 3306)),
+        'pool': database_pool_settings('WORDS_GAME_LANGS_DB'),
     },
     'default': 'common',
 }
 MIGRATIONS_TABLE_INFO = DATABASES_INFO['common']
 
-db = CommonDatabase(DATABASES_INFO['common']['name'],
-                    user=DATABASES_INFO['common']['user'],
-                    password=DATABASES_INFO['common']['password'])
-lang_db = LanguagesDatabase(lang_db=DATABASES_INFO['langs']['name'],
-                            related_common_db=DATABASES_INFO['common']['name'],
-                            user=DATABASES_INFO['langs']['user'],
-                            password=DATABASES_INFO['langs']['password'])
+DEBUG = os.getenv('WORDS_GAME_DEBUG', '0') == '1'
+CONNECTION_LEAK_THRESHOLD = float(os.getenv('WORDS_GAME_CONNECTION_LEAK_THRESHOLD', 10))
+
+SECRET_KEY = os.getenv('WORDS_GAME_SECRET_KEY') or secrets.token_hex(32)
+
+HASHING_EXECUTOR_TYPE = os.getenv('WORDS_GAME_HASHING_EXECUTOR', 'thread')
+HASHING_MAX_WORKERS = int(os.getenv('WORDS_GAME_HASHING_MAX_WORKERS', os.cpu_count() or 1))
+HASHING_MAX_QUEUE_DEPTH = int(os.getenv('WORDS_GAME_HASHING_MAX_QUEUE_DEPTH', 32))
+
+METRICS_TOKEN = os.getenv('WORDS_GAME_METRICS_TOKEN')
+METRICS_ALLOWED_IPS = frozenset(filter(None, os.getenv('WORDS_GAME_METRICS_ALLOWED_IPS', '').split(',')))
+
+TRANSLATIONS_WARM_LOAD = os.getenv('WORDS_GAME_TRANSLATIONS_WARM_LOAD', '1') == '1'
+
+USER_PROFILES_CACHE_TTL = float(os.getenv('WORDS_GAME_USER_PROFILES_CACHE_TTL', 5))
+PROFILE_FRAGMENTS_CACHE = os.getenv('WORDS_GAME_PROFILE_FRAGMENTS_CACHE', '1') == '1'
+PROFILE_FRAGMENTS_CACHE_TTL = float(os.getenv('WORDS_GAME_PROFILE_FRAGMENTS_CACHE_TTL', 30))
+
+TEMPLATES_PRODUCTION_MODE = os.getenv('WORDS_GAME_TEMPLATES_PRODUCTION_MODE', '0' if DEBUG else '1') == '1'
+TEMPLATES_BYTECODE_CACHE_DIR = os.getenv('WORDS_GAME_TEMPLATES_BYTECODE_CACHE_DIR')
+
+DICTIONARIES_FOLDER = os.getenv('WORDS_GAME_DICTIONARIES_FOLDER',
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dictionaries'))
+
+SERVER_BIND = os.getenv('WORDS_GAME_BIND', '127.0.0.1:5000')
+SERVER_WORKERS = int(os.getenv('WORDS_GAME_WORKERS', os.cpu_count() or 1))
+SERVER_KEEP_ALIVE_TIMEOUT = float(os.getenv('WORDS_GAME_KEEP_ALIVE_TIMEOUT', 5))
+SERVER_GRACEFUL_TIMEOUT = float(os.getenv('WORDS_GAME_GRACEFUL_TIMEOUT', 30))
+
+SERVER_FD = os.getenv('WORDS_GAME_SERVER_FD')
+WORKER_BIND = os.getenv('WORDS_GAME_WORKER_BIND')
+
+ROOM_REGISTRY_BACKEND = os.getenv('WORDS_GAME_ROOM_REGISTRY_BACKEND', 'inprocess')
+WORKER_ID = os.getenv('WORDS_GAME_WORKER_ID') or f'{socket.gethostname()}:{os.getpid()}'
+WORKER_URL = os.getenv('WORDS_GAME_WORKER_URL', 'http://{bind}').format(
+    bind=WORKER_BIND or SERVER_BIND, port=(WORKER_BIND or SERVER_BIND).rpartition(':')[2])
+
+INSTALLED_BLUEPRINTS = ['game']
+
+
+def create_db():
+    from game.database import CommonDatabase
+    return CommonDatabase(DATABASES_INFO['common']['name'],
+                          user=DATABASES_INFO['common']['user'],
+                          password=DATABASES_INFO['common']['password'],
+                          host=DATABASES_INFO['common']['host'],
+                          port=DATABASES_INFO['common']['port'],
+                          pool_settings=DATABASES_INFO['common']['pool'],
+                          track_connections=DEBUG)
+
+
+def create_lang_db():
+    from game.database import LanguagesDatabase
+    return LanguagesDatabase(lang_db=DATABASES_INFO['langs']['name'],
+                             related_common_db=DATABASES_INFO['common']['name'],
+                             user=DATABASES_INFO['langs']['user'],
+                             password=DATABASES_INFO['langs']['password'],
+                             host=DATABASES_INFO['langs']['host'],
+                             port=DATABASES_INFO['langs']['port'],
+                             pool_settings=DATABASES_INFO['langs']['pool'],
+                             track_connections=DEBUG)
+
+
+lazy_objects_factories = {
+    'db': create_db,
+    'lang_db': create_lang_db,
+}
 
 
+def __getattr__(name: str):
+    try:
+        factory = lazy_objects_factories[name]
+    except KeyError:
+        raise AttributeError(f'module "{__name__}" has no attribute "{name}"')
+    value = globals()[name] = factory()
+    return value
@@ -0,0 +1,42 @@
+import unittest
+from importlib.util import find_spec
+from unittest import mock
+
+
+@unittest.skipIf(find_spec('mysql') is None, 'mysql-connector-python is not installed')
+class ServeWorkersTestCase(unittest.TestCase):
+    def setUp(self):
+        import management
+        self.management = management
+        self.popen = mock.patch.object(management.subprocess, 'Popen').start()
+        self.popen.return_value.poll.return_value = 0
+        mock.patch.object(management.signal, 'signal').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_serve_starts_every_worker_on_its_own_address(self):
+        self.management.serve('127.0.0.1:0', '3')
+
+        self.assertEqual(self.popen.call_count, 3)
+        workers_envs = [call.kwargs['env'] for call in self.popen.call_args_list]
+        self.assertEqual([env['WORDS_GAME_WORKER_BIND'] for env in workers_envs],
+                         ['127.0.0.1:1', '127.0.0.1:2', '127.0.0.1:3'])
+        self.assertEqual({env['WORDS_GAME_WORKERS'] for env in workers_envs}, {'1'})
+        self.assertEqual(len({env['WORDS_GAME_SERVER_FD'] for env in workers_envs}), 1)
+        self.assertEqual(len({env['WORDS_GAME_SECRET_KEY'] for env in workers_envs}), 1)
+        for call, env in zip(self.popen.call_args_list, workers_envs):
+            self.assertEqual(call.kwargs['pass_fds'], (int(env['WORDS_GAME_SERVER_FD']),))
+            self.assertEqual(call.args[0][-1], 'serve')
+
+    def test_serve_shares_rooms_between_workers(self):
+        with mock.patch.object(self.management.settings, 'ROOM_REGISTRY_BACKEND', 'inprocess'):
+            self.management.serve('127.0.0.1:0', '2')
+
+        self.assertEqual({call.kwargs['env']['WORDS_GAME_ROOM_REGISTRY_BACKEND']
+                          for call in self.popen.call_args_list}, {'mysql'})
+
+    def test_worker_binds(self):
+        self.assertEqual(self.management.worker_binds('0.0.0.0:5000', 2), ['0.0.0.0:5001', '0.0.0.0:5002'])
+
+
+if __name__ == '__main__':
+    unittest.main()